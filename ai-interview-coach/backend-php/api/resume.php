@@ -11,6 +11,7 @@ if ($_SERVER['REQUEST_METHOD'] === 'OPTIONS') {
 }
 
 require_once '../config/db.php';
+require_once '../config/analysis_client.php';
 
 // Enable error reporting for debugging
 error_reporting(E_ALL);
@@ -208,6 +209,12 @@ if ($_SERVER['REQUEST_METHOD'] === 'POST') {
 }
 
 function callPythonAnalysis($file_path) {
+    // Use the warm analysis server when it is running
+    $server_result = callAnalysisServer('resume', ['file_path' => realpath($file_path)]);
+    if ($server_result !== null) {
+        return $server_result;
+    }
+    
     $python_script = __DIR__ . "/../../backend-python/resume_ai.py";
     
     // Escape paths for Windows
@@ -5,6 +5,7 @@ header("Access-Control-Allow-Methods: POST");
 header("Access-Control-Allow-Headers: Content-Type");
 
 require_once '../config/db.php';
+require_once '../config/analysis_client.php';
 
 if ($_SERVER['REQUEST_METHOD'] === 'POST') {
     $data = json_decode(file_get_contents("php://input"));
@@ -20,29 +21,42 @@ if ($_SERVER['REQUEST_METHOD'] === 'POST') {
     $user_id = $data->user_id;
     $answers = $data->answers;
     
-    // Analyze each answer
-    $total_score = 0;
-    $all_feedback = [];
-    $question_count = count((array)$answers);
+    // Get all questions of the test from the database in one query
+    $question_ids = array_keys((array)$answers);
+    $question_texts = [];
+    if (!empty($question_ids)) {
+        $placeholders = implode(',', array_fill(0, count($question_ids), '?'));
+        $stmt = $conn->prepare("SELECT id, question FROM questions WHERE id IN ($placeholders)");
+        $stmt->execute(array_values($question_ids));
+        foreach ($stmt->fetchAll(PDO::FETCH_ASSOC) as $row) {
+            $question_texts[$row['id']] = $row['question'];
+        }
+    }
     
+    // Collect every (question, answer) pair of the test; the ID lets Python use its question index
+    $pairs = [];
     foreach ($answers as $question_id => $answer_text) {
-        // Get question from database
-        $stmt = $conn->prepare("SELECT question FROM questions WHERE id = :id");
-        $stmt->bindParam(":id", $question_id);
-        $stmt->execute();
-        $question = $stmt->fetch(PDO::FETCH_ASSOC)['question'] ?? "General question";
-        
-        // Call Python AI analysis
-        $analysis = analyzeTextWithPython($question, $answer_text);
-        
-        if ($analysis['success']) {
-            $total_score += $analysis['overall_score'];
-            $all_feedback[] = "Q" . $question_id . ": " . $analysis['feedback'];
-        }
+        $pairs[] = [
+            'question_id' => $question_id,
+            'question' => $question_texts[$question_id] ?? "General question",
+            'answer' => (string)$answer_text
+        ];
     }
     
-    // Calculate average score
-    $average_score = $question_count > 0 ? $total_score / $question_count : 0;
+    // Score all answers in one Python call
+    $batch = analyzeTextBatchWithPython($pairs);
+    
+    $all_feedback = [];
+    $average_score = 0;
+    if ($batch['success']) {
+        foreach ($batch['results'] as $index => $analysis) {
+            if ($analysis['success']) {
+                $all_feedback[] = "Q" . $question_ids[$index] . ": " . $analysis['feedback'];
+            }
+        }
+        // Average over all answers, failed ones counting as 0
+        $average_score = $batch['average_score'];
+    }
     $combined_feedback = implode("\n\n", $all_feedback);
     
     // Save to database
@@ -66,14 +80,29 @@ if ($_SERVER['REQUEST_METHOD'] === 'POST') {
     }
 }
 
-function analyzeTextWithPython($question, $answer) {
+function analyzeTextBatchWithPython($pairs) {
+    // Use the warm analysis server when it is running
+    $server_result = callAnalysisServer('text_batch', ['answers' => $pairs]);
+    if ($server_result !== null) {
+        return $server_result;
+    }
+    
+    // Otherwise one interpreter for the whole test, answers passed as JSON on stdin
     $python_script = __DIR__ . "/../../backend-python/text_ai.py";
-    $command = "python " . escapeshellarg($python_script) . " " . 
-               escapeshellarg($question) . " " . escapeshellarg($answer);
-    $output = shell_exec($command);
+    $command = "python " . escapeshellarg($python_script) . " --batch";
+    $process = proc_open($command, [0 => ['pipe', 'r'], 1 => ['pipe', 'w']], $pipes);
     
-    if ($output) {
-        return json_decode($output, true);
+    if (is_resource($process)) {
+        fwrite($pipes[0], json_encode($pairs));
+        fclose($pipes[0]);
+        $output = stream_get_contents($pipes[1]);
+        fclose($pipes[1]);
+        proc_close($process);
+        
+        $result = json_decode($output, true);
+        if (is_array($result)) {
+            return $result;
+        }
     }
     
     return ["success" => false, "error" => "Python script execution failed"];
@@ -5,6 +5,7 @@ header("Access-Control-Allow-Methods: POST");
 header("Access-Control-Allow-Headers: Content-Type");
 
 require_once '../config/db.php';
+require_once '../config/analysis_client.php';
 
 if ($_SERVER['REQUEST_METHOD'] === 'POST') {
     $db = new Database();
@@ -62,7 +63,7 @@ if ($_SERVER['REQUEST_METHOD'] === 'POST') {
         }
         
         // Call Python AI analysis
-        $python_result = analyzeVoiceWithPython($file_path, $question_text);
+        $python_result = analyzeVoiceWithPython($file_path, $question_text, $question_id);
         
         if ($python_result['success']) {
             // Save to database
@@ -94,7 +95,17 @@ if ($_SERVER['REQUEST_METHOD'] === 'POST') {
     }
 }
 
-function analyzeVoiceWithPython($audio_path, $question) {
+function analyzeVoiceWithPython($audio_path, $question, $question_id = 0) {
+    // Use the warm analysis server when it is running
+    $server_result = callAnalysisServer('voice', [
+        'audio_path' => realpath($audio_path),
+        'question' => $question,
+        'question_id' => $question_id > 0 ? $question_id : null
+    ]);
+    if ($server_result !== null) {
+        return $server_result;
+    }
+    
     $python_script = __DIR__ . "/../../backend-python/voice_ai.py";
     $command = "python " . escapeshellarg($python_script) . " " . 
                escapeshellarg($audio_path) . " " . escapeshellarg($question);
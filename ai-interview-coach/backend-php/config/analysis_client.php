@@ -0,0 +1,36 @@
+<?php
+require_once __DIR__ . '/config.php';
+
+// Send a job to the long-running Python analysis server (backend-python/analysis_server.py).
+// Returns the decoded result array, or null if the server is not reachable so the
+// caller can fall back to running the Python script directly.
+function callAnalysisServer($task, $payload = []) {
+    $payload['task'] = $task;
+
+    $context = stream_context_create([
+        'http' => [
+            'method' => 'POST',
+            'header' => "Content-Type: application/json\r\n",
+            'content' => json_encode($payload),
+            'timeout' => ANALYSIS_SERVER_TIMEOUT,
+            'ignore_errors' => true
+        ]
+    ]);
+
+    $response = @file_get_contents(ANALYSIS_SERVER_URL . '/analyze', false, $context);
+
+    if ($response === false) {
+        error_log("Analysis server not reachable at " . ANALYSIS_SERVER_URL);
+        return null;
+    }
+
+    $result = json_decode($response, true);
+
+    if (json_last_error() !== JSON_ERROR_NONE || !is_array($result)) {
+        error_log("Invalid response from analysis server: " . $response);
+        return null;
+    }
+
+    return $result;
+}
+?>
\ No newline at end of file
@@ -17,6 +17,10 @@ define('TEXT_AI_SCRIPT', __DIR__ . '/../../backend-python/text_ai.py');
 define('VOICE_AI_SCRIPT', __DIR__ . '/../../backend-python/voice_ai.py');
 define('VIDEO_AI_SCRIPT', __DIR__ . '/../../backend-python/video_ai.py');
 
+// Analysis Server (backend-python/analysis_server.py)
+define('ANALYSIS_SERVER_URL', 'http://127.0.0.1:8765');
+define('ANALYSIS_SERVER_TIMEOUT', 120); // seconds
+
 // Test Settings
 define('TEXT_TEST_DURATION', 1800); // 30 minutes in seconds
 define('VOICE_TEST_DURATION', 300); // 5 minutes in seconds
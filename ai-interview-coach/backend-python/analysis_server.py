@@ -0,0 +1,381 @@
+import base64
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Streaming sessions without a job for this long are finished and dropped
+STREAM_IDLE_SECONDS = float(os.environ.get('STREAM_IDLE_SECONDS', 300))
+# Open sessions at most; starting one more evicts the least recently used
+MAX_STREAMS = int(os.environ.get('MAX_STREAMS', 32))
+
+
+class AnalysisServer:
+    """Keeps one warm instance of every analyzer and runs JSON jobs against them"""
+
+    STREAM_TASKS = (
+        'text_stream_start', 'text_stream_update', 'text_stream_finish',
+        'voice_stream_start', 'voice_stream_chunk', 'voice_stream_finish',
+        'video_stream_start', 'video_stream_frame', 'video_stream_finish'
+    )
+
+    def __init__(self):
+        self.analyzers = {}
+        self.load_errors = {}
+        # Seconds each analyzer took to import and initialize
+        self.load_seconds = {}
+        # Analyzers are not thread-safe, so each one gets its own lock
+        self.locks = {
+            'resume': threading.Lock(),
+            'text': threading.Lock(),
+            'voice': threading.Lock(),
+            'video': threading.Lock()
+        }
+        # Open streaming sessions: stream id -> [kind, stream, last used]
+        self.streams = {}
+        self.streams_lock = threading.Lock()
+        self.stream_idle_seconds = STREAM_IDLE_SECONDS
+        self.max_streams = MAX_STREAMS
+
+    def load_analyzers(self):
+        """Import and initialize all analyzers once at startup"""
+        loaders = {
+            'resume': self._load_resume,
+            'text': self._load_text,
+            'voice': self._load_voice,
+            'video': self._load_video
+        }
+
+        for name, loader in loaders.items():
+            start = time.perf_counter()
+            try:
+                self.analyzers[name] = loader()
+                self.load_seconds[name] = round(time.perf_counter() - start, 3)
+                print(f"Loaded {name} analyzer in {self.load_seconds[name]}s", file=sys.stderr)
+            except Exception as e:
+                # Keep serving the other analyzers if one stack is missing
+                self.load_errors[name] = str(e)
+                print(f"Could not load {name} analyzer: {e}", file=sys.stderr)
+
+    def _load_resume(self):
+        from resume_ai import ResumeAnalyzer
+        analyzer = ResumeAnalyzer()
+        # spaCy and TextBlob load lazily; the server pays for them up front instead of on the first resume
+        analyzer.nlp_stage.nlp
+        analyzer.nlp_stage.sentiment
+        for module in ('pdfplumber', 'docx'):
+            try:
+                importlib.import_module(module)
+            except ImportError as e:
+                # Only that file type fails
+                print(f"Resume analyzer: {e}", file=sys.stderr)
+        return analyzer
+
+    def _load_text(self):
+        from text_ai import TextAnalyzer
+        from grammar_service import get_language_tool
+        # LanguageTool starts lazily; the server pays for it up front instead of on the first answer
+        get_language_tool()
+        analyzer = TextAnalyzer()
+        if analyzer.semantic is not None:
+            # Embedding model and question matrix, shared with the voice analyzer
+            analyzer.semantic.warm_up()
+        return analyzer
+
+    def _load_voice(self):
+        import librosa
+        from voice_ai import VoiceAnalyzer
+        analyzer = VoiceAnalyzer()
+        # Speech-to-text backend (e.g. the Vosk model) now instead of on the first recording
+        analyzer.stt
+        return analyzer
+
+    def _load_video(self):
+        from video_ai import VideoAnalyzer
+        # Long recordings can be split over several worker processes
+        analyzer = VideoAnalyzer(workers=int(os.environ.get('VIDEO_WORKERS', 1)))
+        # Build the MediaPipe graphs now so the first video doesn't pay for it. One set
+        # covers the in-process path; segment workers (VIDEO_WORKERS > 1) build their own
+        analyzer.graph_pool.warm_up(1)
+        return analyzer
+
+    def handle_job(self, job):
+        """Run a single job and return the analyzer's result dict"""
+        task = job.get('task')
+
+        if task == 'ping':
+            return {
+                'success': True,
+                'loaded': sorted(self.analyzers.keys()),
+                'load_seconds': self.load_seconds,
+                'errors': self.load_errors,
+                'grammar_cache': self.grammar_cache_stats(),
+                'question_index': self.question_index_stats()
+            }
+
+        if task in self.STREAM_TASKS:
+            return self.handle_stream(task, job)
+
+        # All answers of a text test at once: {"answers": [{"question": ..., "answer": ...}]}
+        batch = task == 'text_batch'
+        if batch:
+            task = 'text'
+
+        if task not in self.locks:
+            return {'success': False, 'error': f"Unknown task: {task}"}
+
+        analyzer = self.analyzers.get(task)
+        if analyzer is None:
+            return {
+                'success': False,
+                'error': self.load_errors.get(task, f"{task} analyzer not loaded")
+            }
+
+        # "timings": true adds per-stage seconds to the result (ANALYSIS_TIMINGS does it for all jobs)
+        timings = True if job.get('timings') else None
+
+        try:
+            with self.locks[task]:
+                if task == 'resume':
+                    return analyzer.analyze_resume(self._require_file(job, 'file_path'), timings=timings)
+                elif batch:
+                    from text_ai import batch_pairs
+                    return analyzer.analyze_batch(batch_pairs(job), timings=timings)
+                elif task == 'text':
+                    return analyzer.analyze_text(
+                        job.get('question', ''), job.get('answer', ''),
+                        timings=timings, question_id=job.get('question_id')
+                    )
+                elif task == 'voice':
+                    return analyzer.analyze_audio(
+                        self._require_file(job, 'audio_path'),
+                        job.get('question', ''),
+                        timings=timings,
+                        question_id=job.get('question_id')
+                    )
+                else:
+                    return analyzer.analyze_video(self._require_file(job, 'video_path'), timings=timings)
+        except (KeyError, IndexError, TypeError, FileNotFoundError) as e:
+            return {'success': False, 'error': str(e)}
+
+    def grammar_cache_stats(self):
+        """Hit/miss counters of the shared grammar checker, if it was loaded"""
+        if 'text' not in self.analyzers and 'voice' not in self.analyzers:
+            return None
+        from grammar_service import get_grammar_checker
+        return get_grammar_checker().stats()
+
+    def question_index_stats(self):
+        """Size of the question index used for relevance scoring, if it was loaded"""
+        if 'text' not in self.analyzers and 'voice' not in self.analyzers:
+            return None
+        from question_index import get_question_index
+        return get_question_index().stats()
+
+    def handle_stream(self, task, job):
+        """Streaming jobs: start a session, send edits, chunks or frames, then finish"""
+        kind, action = task.split('_stream_')
+        analyzer = self.analyzers.get(kind)
+        if analyzer is None:
+            return {
+                'success': False,
+                'error': self.load_errors.get(kind, f"{kind} analyzer not loaded")
+            }
+
+        if action == 'start':
+            try:
+                if kind == 'text':
+                    stream = analyzer.start_session(job.get('question', ''), job.get('question_id'))
+                elif kind == 'voice':
+                    stream = analyzer.start_stream(
+                        job.get('question', ''), int(job.get('sample_rate', 16000)), job.get('question_id')
+                    )
+                else:
+                    stream = analyzer.start_stream(
+                        float(job.get('fps', 30.0)), int(job.get('stride', 1))
+                    )
+            except (ValueError, TypeError) as e:
+                return {'success': False, 'error': f"Invalid stream parameters: {e}"}
+
+            self.evict_streams(make_room=True)
+            stream_id = uuid.uuid4().hex
+            with self.streams_lock:
+                self.streams[stream_id] = [kind, stream, time.monotonic()]
+            return {'success': True, 'stream_id': stream_id}
+
+        with self.streams_lock:
+            if action == 'finish':
+                entry = self.streams.pop(job.get('stream_id'), None)
+            else:
+                entry = self.streams.get(job.get('stream_id'))
+                if entry is not None:
+                    entry[2] = time.monotonic()
+
+        if entry is None or entry[0] != kind:
+            return {'success': False, 'error': 'Unknown stream_id'}
+        stream = entry[1]
+
+        # Same lock as the analyzer's batch jobs; streams share its models
+        with self.locks[kind]:
+            if action == 'finish':
+                return stream.finish()
+            return self.feed_stream(kind, stream, job)
+
+    def feed_stream(self, kind, stream, job):
+        """Send one edit, audio chunk or frame to an open stream"""
+        try:
+            if kind == 'text':
+                # Either the whole answer or one edit: replace text[start:end] with replacement
+                if 'text' in job:
+                    return stream.update(job['text'])
+                return stream.apply_edit(
+                    int(job.get('start', 0)), int(job.get('end', 0)), job.get('replacement', '')
+                )
+            if kind == 'voice':
+                # Chunks are base64 encoded 16-bit mono PCM at the stream's sample rate
+                return stream.feed_pcm16(base64.b64decode(job.get('pcm16', '')))
+            # Frames are base64 encoded images (JPEG, PNG, ...)
+            stream.feed_encoded(base64.b64decode(job.get('frame', '')))
+            return {'success': True, 'frames_received': stream.frames_received}
+        except (ValueError, TypeError) as e:
+            return {'success': False, 'error': str(e)}
+
+    def evict_streams(self, make_room=False, evict_all=False):
+        """Finish sessions idle for longer than stream_idle_seconds.
+
+        With make_room, also evict the least recently used sessions so a new
+        one fits under max_streams. Finishing stops the session's worker
+        thread and returns any graphs it checked out.
+        """
+        now = time.monotonic()
+        with self.streams_lock:
+            evicted = [
+                stream_id for stream_id, entry in self.streams.items()
+                if evict_all or now - entry[2] > self.stream_idle_seconds
+            ]
+            if make_room:
+                remaining = sorted(
+                    (entry[2], stream_id) for stream_id, entry in self.streams.items()
+                    if stream_id not in evicted
+                )
+                excess = len(remaining) - (self.max_streams - 1)
+                evicted.extend(stream_id for _, stream_id in remaining[:max(0, excess)])
+            entries = [self.streams.pop(stream_id) for stream_id in evicted]
+
+        for kind, stream, _ in entries:
+            try:
+                with self.locks[kind]:
+                    stream.finish()
+            except Exception as e:
+                print(f"Error closing {kind} stream: {e}", file=sys.stderr)
+        if entries:
+            print(f"Closed {len(entries)} abandoned stream(s)", file=sys.stderr)
+        return len(entries)
+
+    def start_stream_reaper(self, interval=30.0):
+        """Background thread that regularly finishes idle streaming sessions"""
+        def reap():
+            while True:
+                time.sleep(interval)
+                self.evict_streams()
+
+        thread = threading.Thread(target=reap, daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        """Finish open streams, then release worker pools and MediaPipe graphs held by the analyzers"""
+        self.evict_streams(evict_all=True)
+        for name in ('resume', 'video'):
+            analyzer = self.analyzers.get(name)
+            if analyzer is not None:
+                analyzer.close()
+
+    def _require_file(self, job, key):
+        """Get a file path from the job and make sure it exists"""
+        if key not in job:
+            raise KeyError(f"Missing field: {key}")
+        path = job[key]
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+        return path
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end: POST /analyze with a JSON job, get the result back as JSON"""
+
+    server_version = 'AIInterviewCoachAnalysis/1.0'
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/analyze':
+            self._send_json(404, {'success': False, 'error': 'Not found'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            job = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send_json(400, {'success': False, 'error': 'Invalid JSON'})
+            return
+
+        if not isinstance(job, dict):
+            self._send_json(400, {'success': False, 'error': 'Job must be a JSON object'})
+            return
+
+        result = self.server.analysis.handle_job(job)
+        self._send_json(200, result)
+
+    def do_GET(self):
+        # Health check
+        if self.path.rstrip('/') == '/ping':
+            self._send_json(200, self.server.analysis.handle_job({'task': 'ping'}))
+        else:
+            self._send_json(404, {'success': False, 'error': 'Not found'})
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        print(f"{self.address_string()} - {format % args}", file=sys.stderr)
+
+
+def run_server(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Load the analyzers and serve jobs until interrupted"""
+    analysis = AnalysisServer()
+    analysis.load_analyzers()
+
+    httpd = ThreadingHTTPServer((host, port), AnalysisRequestHandler)
+    httpd.analysis = analysis
+    analysis.start_stream_reaper()
+    print(f"Analysis server listening on http://{host}:{port}", file=sys.stderr)
+
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        analysis.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Long-running analysis server for the PHP backend')
+    parser.add_argument('--host', default=os.environ.get('ANALYSIS_SERVER_HOST', DEFAULT_HOST))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('ANALYSIS_SERVER_PORT', DEFAULT_PORT)))
+    args = parser.parse_args()
+
+    run_server(args.host, args.port)
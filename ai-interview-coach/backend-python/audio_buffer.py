@@ -0,0 +1,71 @@
+import numpy as np
+
+# Frame settings shared by the RMS and silence analysis (librosa defaults)
+FRAME_LENGTH = 2048
+HOP_LENGTH = 512
+
+
+class AudioBuffer:
+    """Audio decoded once at its native sample rate, shared by every analysis stage"""
+
+    def __init__(self, samples, sample_rate):
+        self.samples = np.asarray(samples, dtype=np.float32)
+        self.sample_rate = int(sample_rate)
+        self._rms = None
+        self._intervals = {}
+
+    @classmethod
+    def load(cls, audio_path):
+        """Decode an audio file to mono float samples without resampling"""
+        import librosa
+        samples, sample_rate = librosa.load(audio_path, sr=None, mono=True)
+        return cls(samples, sample_rate)
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.sample_rate if self.sample_rate else 0
+
+    def slice(self, start, end):
+        """A new buffer with samples [start, end)"""
+        return AudioBuffer(self.samples[start:end], self.sample_rate)
+
+    def to_pcm16(self):
+        """16-bit little-endian PCM bytes, e.g. for speech_recognition.AudioData"""
+        return (np.clip(self.samples, -1.0, 1.0) * 32767).astype('<i2').tobytes()
+
+    def rms(self):
+        """Frame-wise RMS energy, computed once"""
+        if self._rms is None:
+            import librosa
+            self._rms = librosa.feature.rms(
+                y=self.samples, frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH
+            )[0]
+        return self._rms
+
+    def nonsilent_intervals(self, top_db=30):
+        """Same result as librosa.effects.split(y, top_db), reusing the cached RMS"""
+        if top_db not in self._intervals:
+            self._intervals[top_db] = split_nonsilent(self.rms(), len(self.samples), top_db)
+        return self._intervals[top_db]
+
+
+def split_nonsilent(rms, sample_count, top_db=30, hop_length=HOP_LENGTH):
+    """Non-silent [start, end) sample intervals from frame RMS values"""
+    import librosa
+
+    if len(rms) == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    db = librosa.amplitude_to_db(rms, ref=np.max, top_db=None)
+    non_silent = db > -top_db
+
+    # Frame indices where the signal switches between silent and non-silent
+    edges = [np.flatnonzero(np.diff(non_silent.astype(int))) + 1]
+    if non_silent[0]:
+        edges.insert(0, [0])
+    if non_silent[-1]:
+        edges.append([len(non_silent)])
+
+    edges = librosa.frames_to_samples(np.concatenate(edges), hop_length=hop_length)
+    edges = np.minimum(edges, sample_count)
+    return edges.reshape((-1, 2))
@@ -0,0 +1,241 @@
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from benchmark_fixtures import DEFAULT_FIXTURE_DIR, generate_fixtures
+
+ANALYZERS = ('text', 'voice', 'video', 'resume')
+
+# Slow-to-import dependencies; the report shows when each one gets loaded
+HEAVY_MODULES = (
+    'spacy', 'pdfplumber', 'docx', 'nltk', 'textblob', 'language_tool_python',
+    'librosa', 'speech_recognition', 'vosk', 'cv2', 'mediapipe'
+)
+
+
+def loaded_heavy_modules():
+    return [module for module in HEAVY_MODULES if module in sys.modules]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def latency_stats(seconds):
+    if not seconds:
+        return None
+    values = np.asarray(seconds)
+    return {
+        'runs': len(values),
+        'mean': round(float(values.mean()), 6),
+        'p50': round(float(np.percentile(values, 50)), 6),
+        'p95': round(float(np.percentile(values, 95)), 6),
+        'min': round(float(values.min()), 6),
+        'max': round(float(values.max()), 6)
+    }
+
+
+def create_analyzer(name, stt_backend):
+    if name == 'text':
+        from text_ai import TextAnalyzer
+        return TextAnalyzer()
+    elif name == 'voice':
+        from voice_ai import VoiceAnalyzer
+        from speech_backends import get_backend
+        return VoiceAnalyzer(stt_backend=get_backend(stt_backend))
+    elif name == 'video':
+        from video_ai import VideoAnalyzer
+        return VideoAnalyzer()
+    elif name == 'resume':
+        from resume_ai import ResumeAnalyzer
+        # Measure the analysis itself, not cache hits
+        return ResumeAnalyzer(use_cache=False)
+    raise ValueError(f"Unknown analyzer: {name}")
+
+
+def run_fixture(name, analyzer, fixture):
+    """Run one analysis and return (result, stage seconds)"""
+    if name == 'text':
+        result = analyzer.analyze_text(fixture['question'], fixture['answer'], timings=True)
+    elif name == 'voice':
+        result = analyzer.analyze_audio(fixture['path'], fixture['question'], timings=True)
+    elif name == 'video':
+        result = analyzer.analyze_video(fixture['path'], timings=True)
+    else:
+        result = analyzer.analyze_resume(fixture['path'], timings=True)
+    return result, result.pop('timings', {})
+
+
+def benchmark_analyzer(name, fixtures, repeats, stt_backend):
+    """Benchmark one analyzer; runs in a fresh process so cold numbers include imports"""
+    # Analyzer demo prints would end up in the JSON report
+    sys.stdout = sys.stderr
+
+    start = time.perf_counter()
+    analyzer = create_analyzer(name, stt_backend)
+    report = {
+        'load_seconds': round(time.perf_counter() - start, 4),
+        'modules_at_startup': loaded_heavy_modules(),
+        'fixtures': {}
+    }
+
+    for fixture in fixtures:
+        if 'skipped' in fixture:
+            report['fixtures'][fixture['name']] = {'skipped': fixture['skipped']}
+            continue
+
+        # (seconds, stages) of successful runs only; failures return early and would look fast
+        runs = []
+        cold_seconds = None
+        errors = 0
+        error = None
+        modules_before = set(loaded_heavy_modules())
+        # The first run of each fixture is the cold one
+        for repeat in range(repeats + 1):
+            start = time.perf_counter()
+            result, stages = run_fixture(name, analyzer, fixture)
+            elapsed = time.perf_counter() - start
+            if not result.get('success'):
+                errors += 1
+                error = result.get('error')
+            elif repeat == 0:
+                cold_seconds = round(elapsed, 4)
+            else:
+                runs.append((elapsed, stages))
+
+        warm_stages = [stages for _, stages in runs]
+        stage_names = dict.fromkeys(stage for stages in warm_stages for stage in stages)
+        report['fixtures'][fixture['name']] = {
+            'cold_seconds': cold_seconds,
+            # Dependencies this fixture was first to import
+            'modules_loaded': [module for module in loaded_heavy_modules() if module not in modules_before],
+            'warm': latency_stats([seconds for seconds, _ in runs]),
+            'stages': {
+                stage: latency_stats([stages[stage] for stages in warm_stages if stage in stages])
+                for stage in stage_names
+            },
+            'errors': errors,
+            'error': error
+        }
+
+    report['peak_rss_mb'] = peak_rss_mb()
+    return report
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_benchmarks(analyzers=ANALYZERS, repeats=5, fixture_dir=DEFAULT_FIXTURE_DIR, stt_backend='stub',
+                   startup_only=False):
+    """Benchmark each analyzer in its own process and return the JSON report"""
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeats': repeats,
+        'stt_backend': stt_backend,
+        'analyzers': {}
+    }
+
+    # spawn gives every analyzer a clean interpreter on every platform
+    context = multiprocessing.get_context('spawn')
+    for name in analyzers:
+        print(f"Benchmarking {name} analyzer...", file=sys.stderr)
+        try:
+            # Per analyzer, so a missing optional dependency only skips that one
+            fixtures = [] if startup_only else generate_fixtures(fixture_dir, [name])[name]
+        except ImportError as e:
+            report['analyzers'][name] = {'skipped': f"Could not generate fixtures: {e}"}
+            continue
+        except Exception as e:
+            report['analyzers'][name] = {'error': f"Could not generate fixtures: {e}"}
+            continue
+
+        try:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                report['analyzers'][name] = executor.submit(
+                    benchmark_analyzer, name, fixtures, repeats, stt_backend
+                ).result()
+        except Exception as e:
+            report['analyzers'][name] = {'error': str(e)}
+
+    return report
+
+
+def compare_reports(baseline, current):
+    """Warm p50 of every fixture in both reports: (analyzer, fixture, before, after)"""
+    rows = []
+    for name, analyzer in current['analyzers'].items():
+        before_fixtures = baseline.get('analyzers', {}).get(name, {}).get('fixtures', {})
+        for fixture, stats in analyzer.get('fixtures', {}).items():
+            before = (before_fixtures.get(fixture) or {}).get('warm')
+            if before and stats.get('warm'):
+                rows.append((name, fixture, before['p50'], stats['warm']['p50']))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the analyzers on generated fixtures')
+    parser.add_argument('analyzers', nargs='*', help='Analyzers to benchmark: text, voice, video, resume (default: all)')
+    parser.add_argument('--repeats', type=int, default=5, help='Warm runs per fixture (default: 5)')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURE_DIR, help='Fixture directory')
+    parser.add_argument('--stt', default='stub',
+                        help='Speech-to-text backend for the voice analyzer (default: stub)')
+    parser.add_argument('--startup-only', action='store_true',
+                        help='Only measure import and initialization time of each analyzer')
+    parser.add_argument('--output', default=None, help='Write the JSON report here (default: stdout)')
+    parser.add_argument('--compare', default=None, help='Earlier JSON report to compare warm p50 against')
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.analyzers if name not in ANALYZERS]
+    if unknown:
+        parser.error(f"unknown analyzer(s): {', '.join(unknown)}")
+
+    report = run_benchmarks(
+        args.analyzers or ANALYZERS, args.repeats, args.fixtures, args.stt, args.startup_only
+    )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        for name, fixture, before, after in compare_reports(baseline, report):
+            change = (after - before) / before * 100 if before else 0
+            print(f"{name:8} {fixture:12} p50 {before:.4f}s -> {after:.4f}s ({change:+.1f}%)", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+import hashlib
+import json
+import os
+import random
+import wave
+
+import numpy as np
+
+# Fixtures are generated from a fixed seed, so every run sees identical inputs
+SEED = 1234
+
+# Bump when a writer changes; together with the seed and the fixture's
+# parameters it is part of every file name, so stale files are never reused
+GENERATOR_VERSION = 1
+
+DEFAULT_FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'cache', 'benchmark_fixtures'
+)
+
+QUESTION = "Tell me about a project where you used Python to solve a difficult problem."
+
+ANSWER_WORDS = [
+    'i', 'worked', 'on', 'a', 'project', 'where', 'we', 'used', 'python', 'to',
+    'build', 'data', 'pipeline', 'the', 'team', 'needed', 'faster', 'reports',
+    'so', 'designed', 'and', 'tested', 'new', 'service', 'with', 'sql', 'api',
+    'problem', 'solution', 'improved', 'performance', 'by', 'fifty', 'percent',
+    'learned', 'how', 'communicate', 'clearly', 'under', 'pressure', 'deadline'
+]
+
+RESUME_SKILLS = [
+    'Python', 'Java', 'JavaScript', 'React', 'Node.js', 'SQL', 'MongoDB', 'Docker',
+    'Kubernetes', 'AWS', 'Git', 'Machine Learning', 'TensorFlow', 'Django', 'Flask',
+    'HTML', 'CSS', 'Linux', 'Agile', 'Communication', 'Leadership'
+]
+
+# Answer lengths in words
+ANSWER_LENGTHS = {'short': 30, 'medium': 120, 'long': 400}
+
+# Voice answer lengths in seconds
+VOICE_LENGTHS = {'5s': 5, '20s': 20, '60s': 60}
+
+# Video lengths in seconds (rendered at 640x480, 30 fps)
+VIDEO_LENGTHS = {'10s': 10, '30s': 30}
+
+# Resume variants: (format, pages)
+RESUME_VARIANTS = {
+    'txt_1page': ('txt', 1),
+    'docx_1page': ('docx', 1),
+    'pdf_1page': ('pdf', 1),
+    'pdf_4pages': ('pdf', 4),
+    'pdf_12pages': ('pdf', 12)
+}
+
+LINES_PER_PAGE = 45
+
+
+def make_answer(rng, words):
+    """A pseudo answer of the given length, split into sentences"""
+    sentences = []
+    remaining = words
+    while remaining > 0:
+        length = min(remaining, rng.randint(8, 16))
+        sentence = " ".join(rng.choice(ANSWER_WORDS) for _ in range(length))
+        sentences.append(sentence[0].upper() + sentence[1:] + ".")
+        remaining -= length
+    return " ".join(sentences)
+
+
+def make_resume_lines(rng, pages):
+    """Resume text lines with contact details, sections and skills"""
+    lines = [
+        "Jordan Example",
+        "jordan.example@example.com | +1 555 010 2030 | linkedin.com/in/jordan-example",
+        "",
+        "SUMMARY",
+        "Software engineer with 5 years of experience building web services.",
+        "",
+        "SKILLS",
+        ", ".join(rng.sample(RESUME_SKILLS, 10)),
+        "",
+        "EDUCATION",
+        "Bachelor of Technology in Computer Science, Example University, 2018",
+        "",
+        "EXPERIENCE"
+    ]
+
+    # Fill up to the requested page count, leaving room for the projects section
+    job = 0
+    while len(lines) + 11 <= pages * LINES_PER_PAGE:
+        job += 1
+        lines.append(f"Software Engineer {job}, Example Corp ({2024 - job} - {2025 - job})")
+        for _ in range(6):
+            skills = " and ".join(rng.sample(RESUME_SKILLS, 2))
+            lines.append(f"- {make_answer(rng, 12)[:-1]} using {skills}.")
+        lines.append("")
+
+    lines += ["", "PROJECTS", "- Interview coach: analysis of text, voice and video answers."]
+    return lines
+
+
+def write_txt(path, lines):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines))
+
+
+def write_docx(path, lines):
+    import docx
+
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def write_pdf(path, lines):
+    """Write a plain text PDF (Helvetica, one page per LINES_PER_PAGE lines)"""
+    def escape(text):
+        return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+
+    # Objects 1-3 are the catalog, page tree and font; then a page and a content stream per page
+    objects = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page_lines in pages:
+        text = ["BT", "/F1 10 Tf", "14 TL", "50 760 Td"]
+        for line in page_lines:
+            text.append(f"({escape(line)}) Tj T*")
+        text.append("ET")
+        stream = "\n".join(text).encode('latin-1', errors='replace')
+
+        page_id = len(objects) + 1
+        page_ids.append(page_id)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+def write_wav(path, seconds, rng, sample_rate=16000):
+    """Speech-like audio: voiced tone bursts separated by short pauses, over light noise"""
+    np_rng = np.random.default_rng(rng.randint(0, 2 ** 31))
+    samples = np_rng.normal(0, 0.005, int(seconds * sample_rate))
+
+    position = 0
+    while position < len(samples):
+        # A "word" of 0.2-0.6 s followed by a 0.05-0.8 s gap
+        length = int(rng.uniform(0.2, 0.6) * sample_rate)
+        pitch = rng.uniform(110, 220)
+        t = np.arange(min(length, len(samples) - position)) / sample_rate
+        envelope = np.sin(np.pi * t / (length / sample_rate)) ** 2
+        burst = 0.3 * envelope * (np.sin(2 * np.pi * pitch * t) + 0.3 * np.sin(4 * np.pi * pitch * t))
+        samples[position:position + len(burst)] += burst
+        position += length + int(rng.uniform(0.05, 0.8) * sample_rate)
+
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2')
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm.tobytes())
+
+
+def write_video(path, seconds, rng, fps=30, size=(640, 480)):
+    """A rendered head-and-shoulders figure that mostly sits still, with occasional movement"""
+    import cv2
+
+    width, height = size
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, size)
+    offset_x, offset_y = 0.0, 0.0
+    target_x, target_y = 0.0, 0.0
+
+    for frame_number in range(int(seconds * fps)):
+        # Pick a new resting position every few seconds and drift towards it
+        if frame_number % (fps * 3) == 0:
+            target_x, target_y = rng.uniform(-40, 40), rng.uniform(-15, 15)
+        offset_x += (target_x - offset_x) * 0.1
+        offset_y += (target_y - offset_y) * 0.1
+        cx, cy = int(width / 2 + offset_x), int(height / 2 + offset_y)
+
+        frame = np.full((height, width, 3), (70, 60, 50), dtype=np.uint8)
+        cv2.rectangle(frame, (cx - 150, cy + 70), (cx + 150, height), (90, 40, 30), -1)
+        cv2.ellipse(frame, (cx, cy - 30), (70, 90), 0, 0, 360, (150, 180, 220), -1)
+        cv2.circle(frame, (cx - 25, cy - 50), 8, (40, 40, 40), -1)
+        cv2.circle(frame, (cx + 25, cy - 50), 8, (40, 40, 40), -1)
+        cv2.ellipse(frame, (cx, cy + 10), (25, 10), 0, 0, 180, (60, 60, 160), 3)
+        writer.write(frame)
+
+    writer.release()
+
+
+def fixture_path(directory, prefix, name, extension, *params):
+    """Path of a generated file, named after the generator version, seed and parameters"""
+    key = json.dumps([GENERATOR_VERSION, SEED, prefix, name, params])
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:10]
+    return os.path.join(directory, f"{prefix}_{name}_{digest}.{extension}")
+
+
+def ensure_file(path, write, *args):
+    """Write a fixture unless it exists; written under a temporary name so an
+    interrupted run never leaves a partial file behind"""
+    if os.path.exists(path):
+        return
+    root, extension = os.path.splitext(path)
+    temp_path = f"{root}.{os.getpid()}.tmp{extension}"
+    try:
+        write(temp_path, *args)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def generate_fixtures(directory=DEFAULT_FIXTURE_DIR, analyzers=('text', 'voice', 'video', 'resume')):
+    """Create (or reuse) the benchmark inputs and return {analyzer: [fixture, ...]}.
+
+    A fixture whose writer needs a missing optional package (python-docx)
+    is returned with a 'skipped' reason instead of a path.
+    """
+    os.makedirs(directory, exist_ok=True)
+    fixtures = {}
+
+    # Each fixture gets its own seeded generator, so adding or skipping one
+    # does not change the others
+    def seeded(name):
+        return random.Random(f"{SEED}-{name}")
+
+    if 'text' in analyzers:
+        fixtures['text'] = [
+            {'name': name, 'question': QUESTION, 'answer': make_answer(seeded(name), words)}
+            for name, words in ANSWER_LENGTHS.items()
+        ]
+
+    if 'voice' in analyzers:
+        fixtures['voice'] = []
+        for name, seconds in VOICE_LENGTHS.items():
+            path = fixture_path(directory, 'voice', name, 'wav', seconds)
+            ensure_file(path, write_wav, seconds, seeded(name))
+            fixtures['voice'].append({'name': name, 'path': path, 'question': QUESTION})
+
+    if 'video' in analyzers:
+        fixtures['video'] = []
+        for name, seconds in VIDEO_LENGTHS.items():
+            path = fixture_path(directory, 'video', name, 'mp4', seconds)
+            ensure_file(path, write_video, seconds, seeded(name))
+            fixtures['video'].append({'name': name, 'path': path})
+
+    if 'resume' in analyzers:
+        fixtures['resume'] = []
+        writers = {'txt': write_txt, 'docx': write_docx, 'pdf': write_pdf}
+        for name, (extension, pages) in RESUME_VARIANTS.items():
+            path = fixture_path(directory, 'resume', name, extension, pages, LINES_PER_PAGE)
+            try:
+                ensure_file(path, writers[extension], make_resume_lines(seeded(name), pages))
+            except ImportError as e:
+                fixtures['resume'].append({'name': name, 'skipped': f"missing dependency: {e}"})
+                continue
+            fixtures['resume'].append({'name': name, 'path': path})
+
+    # What each file is, merged with the analyzers generated by earlier calls
+    manifest_path = os.path.join(directory, 'manifest.json')
+    manifest = {}
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f).get('fixtures', {})
+        except (OSError, ValueError):
+            manifest = {}
+    manifest.update(fixtures)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({'seed': SEED, 'generator_version': GENERATOR_VERSION, 'fixtures': manifest}, f, indent=2)
+
+    return fixtures
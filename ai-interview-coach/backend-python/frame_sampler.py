@@ -0,0 +1,169 @@
+import cv2
+import numpy as np
+
+
+def uniform_indices(total_frames, budget):
+    """Spread up to budget frame indices evenly over the whole video"""
+    if total_frames <= 0 or budget <= 0:
+        return np.zeros(0, dtype=np.int64)
+    count = min(budget, total_frames)
+    return np.unique(np.linspace(0, total_frames - 1, count).round().astype(np.int64))
+
+
+def stride_indices(total_frames, stride, budget):
+    """Every stride-th frame from the start, up to budget frames"""
+    if total_frames <= 0 or budget <= 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.arange(0, total_frames, max(1, stride), dtype=np.int64)[:budget]
+
+
+def sequential_indices(total_frames, budget):
+    """The first budget frames (the original behaviour)"""
+    return np.arange(min(max(total_frames, 0), max(budget, 0)), dtype=np.int64)
+
+
+def landmark_motion(face_points, has_face, pose_points, has_pose):
+    """Landmark change between consecutive sampled frames, one value per gap.
+
+    A face or body appearing or disappearing counts as maximum motion.
+    """
+    if len(has_face) < 2:
+        return np.zeros(0)
+
+    face_change = np.abs(np.diff(face_points[:, :, :2], axis=0)).mean(axis=(1, 2))
+    pose_change = np.abs(np.diff(pose_points[:, :, :2], axis=0)).mean(axis=(1, 2))
+
+    both_face = has_face[1:] & has_face[:-1]
+    both_pose = has_pose[1:] & has_pose[:-1]
+    motion = np.where(both_face, face_change, 0) + np.where(both_pose, pose_change, 0)
+
+    changed = (has_face[1:] != has_face[:-1]) | (has_pose[1:] != has_pose[:-1])
+    if np.any(motion > 0):
+        motion[changed] = motion.max()
+    else:
+        motion[changed] = 1.0
+    return motion
+
+
+def allocate_by_motion(indices, motion, extra_budget):
+    """Pick up to extra_budget additional frames inside the gaps between indices,
+    giving more frames to gaps with more landmark motion."""
+    if extra_budget <= 0 or len(indices) < 2 or not np.any(motion > 0):
+        return np.zeros(0, dtype=np.int64)
+
+    gap_sizes = np.diff(indices) - 1
+    weights = np.where(gap_sizes > 0, motion, 0)
+    if not np.any(weights > 0):
+        return np.zeros(0, dtype=np.int64)
+
+    shares = np.floor(weights / weights.sum() * extra_budget).astype(np.int64)
+    shares = np.minimum(shares, gap_sizes)
+
+    extra = []
+    for start, end, share in zip(indices[:-1], indices[1:], shares):
+        if share > 0:
+            # Evenly spaced frames strictly inside the gap
+            extra.append(np.linspace(start, end, share + 2)[1:-1].round().astype(np.int64))
+
+    if not extra:
+        return np.zeros(0, dtype=np.int64)
+    return np.setdiff1d(np.unique(np.concatenate(extra)), indices)
+
+
+def count_frames(video_path):
+    """Count frames by demuxing the whole file, for containers that don't report it"""
+    cap = cv2.VideoCapture(video_path)
+    count = 0
+    while cap.grab():
+        count += 1
+    cap.release()
+    return count
+
+
+def read_frames(cap, indices, seek_threshold=30):
+    """Yield (index, frame) for the given sorted frame indices.
+
+    Short gaps are skipped with grab(), which avoids converting frames we
+    don't need; long gaps seek straight to the target frame.
+    """
+    position = 0
+    for index in indices:
+        index = int(index)
+        gap = index - position
+        if gap > seek_threshold:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+        else:
+            for _ in range(gap):
+                if not cap.grab():
+                    return
+        ret, frame = cap.read()
+        if not ret:
+            return
+        position = index + 1
+        yield index, frame
+
+
+def downscale(frame, max_width):
+    """Shrink a frame to at most max_width pixels wide, keeping the aspect ratio"""
+    if not max_width:
+        return frame
+    height, width = frame.shape[:2]
+    if width <= max_width:
+        return frame
+    scale = max_width / width
+    return cv2.resize(frame, (max_width, max(1, int(round(height * scale)))), interpolation=cv2.INTER_AREA)
+
+
+class MotionGate:
+    """Cheap frame-difference check in front of the MediaPipe graphs.
+
+    Each frame is reduced to a small grayscale thumbnail and compared with
+    the thumbnail of the last frame that went through full inference. If
+    the mean absolute difference stays below threshold (0-255 scale), the
+    previous landmarks are carried forward instead. A full inference is
+    still forced after max_skip carried frames in a row.
+    """
+
+    def __init__(self, threshold=2.0, max_skip=10, width=64):
+        self.threshold = threshold
+        self.max_skip = max_skip
+        self.width = width
+        self.reference = None
+        self.skipped_in_row = 0
+        self.inferred = 0
+        self.skipped = 0
+
+    def signature(self, frame):
+        height, width = frame.shape[:2]
+        size = (self.width, max(1, int(round(height * self.width / width))))
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small.astype(np.float32)
+
+    def needs_inference(self, frame):
+        """True if the scene changed enough since the last full inference"""
+        if not self.threshold:
+            self.inferred += 1
+            return True
+
+        signature = self.signature(frame)
+        changed = (
+            self.reference is None or
+            self.skipped_in_row >= self.max_skip or
+            float(np.abs(signature - self.reference).mean()) >= self.threshold
+        )
+
+        if changed:
+            self.reference = signature
+            self.skipped_in_row = 0
+            self.inferred += 1
+        else:
+            self.skipped_in_row += 1
+            self.skipped += 1
+        return changed
+
+    @property
+    def skipped_fraction(self):
+        total = self.inferred + self.skipped
+        return self.skipped / total if total else 0.0
@@ -0,0 +1,245 @@
+import atexit
+import bisect
+import copy
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+
+# Memoized grammar checks kept per process (0 disables the cache)
+GRAMMAR_CACHE_SIZE = int(os.environ.get('GRAMMAR_CACHE_SIZE', 4096))
+
+# Set GRAMMAR_SENTENCE_CACHE=1 to check and cache sentence by sentence, so a
+# resubmitted answer only sends its edited sentences to LanguageTool
+GRAMMAR_SENTENCE_CACHE = os.environ.get('GRAMMAR_SENTENCE_CACHE', '0') not in ('', '0')
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# A sentence runs up to its closing punctuation (or the end of the text)
+SENTENCE_PATTERN = re.compile(r'\S.*?(?:[.!?]+(?=\s|$)|$)')
+
+# One LanguageTool (and one Java server) per process, shared by every analyzer
+_tool = None
+_tool_lock = threading.Lock()
+_checker = None
+
+
+def get_language_tool():
+    """Get the process-wide LanguageTool instance, starting it on first use"""
+    global _tool
+    if _tool is None:
+        with _tool_lock:
+            if _tool is None:
+                import language_tool_python
+
+                # Point several worker processes at one already running server
+                remote_server = os.environ.get('LANGUAGETOOL_URL')
+                if remote_server:
+                    _tool = language_tool_python.LanguageTool('en-US', remote_server=remote_server)
+                else:
+                    _tool = language_tool_python.LanguageTool('en-US')
+                atexit.register(close_language_tool)
+    return _tool
+
+
+def normalize_text(text):
+    """Collapse whitespace runs to single spaces and strip the ends"""
+    return WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+def normalized_positions(text):
+    """Index in text of every character of normalize_text(text)"""
+    positions = []
+    space = None
+    for index, char in enumerate(text):
+        if char.isspace():
+            if positions and space is None:
+                space = index
+        else:
+            if space is not None:
+                positions.append(space)
+                space = None
+            positions.append(index)
+    return positions
+
+
+def split_sentences(text):
+    """(offset, sentence) pairs of a normalized text"""
+    return [(match.start(), match.group()) for match in SENTENCE_PATTERN.finditer(text)]
+
+
+class MatchCache:
+    """Bounded LRU of grammar matches keyed on normalized text"""
+
+    def __init__(self, max_items=GRAMMAR_CACHE_SIZE):
+        self.max_items = max_items
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, matches):
+        if self.max_items <= 0:
+            return
+        with self.lock:
+            self.entries[key] = matches
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_items:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'items': len(self.entries),
+                'max_items': self.max_items
+            }
+
+
+def close_language_tool():
+    """Shut down the shared LanguageTool server"""
+    global _tool
+    with _tool_lock:
+        if _tool is not None:
+            try:
+                _tool.close()
+            except Exception as e:
+                print(f"Error closing LanguageTool: {e}", file=sys.stderr)
+            _tool = None
+
+
+class GrammarChecker:
+    """Grammar checking on top of the shared LanguageTool instance.
+
+    Checks are memoized on whitespace-normalized text, either per whole text
+    or per sentence (sentence_cache=True). Match offsets are always relative
+    to the text that was passed in.
+    """
+
+    # Answers are joined into separate paragraphs for a batched check
+    separator = '\n\n'
+
+    def __init__(self, tool=None, cache_size=GRAMMAR_CACHE_SIZE, sentence_cache=GRAMMAR_SENTENCE_CACHE):
+        self._tool = tool
+        self.cache = MatchCache(cache_size)
+        self.sentence_cache = sentence_cache
+
+    @property
+    def tool(self):
+        if self._tool is None:
+            self._tool = get_language_tool()
+        return self._tool
+
+    def check(self, text):
+        """Check a single text, same result as LanguageTool.check"""
+        return self.check_batch([text])[0]
+
+    def check_batch(self, texts):
+        """Check many texts, sending only uncached ones to LanguageTool in one round-trip.
+
+        Returns one list of matches per input text, with offsets relative
+        to that text.
+        """
+        normalized = [normalize_text(text) for text in texts]
+        if self.sentence_cache:
+            units = [split_sentences(text) for text in normalized]
+        else:
+            units = [[(0, text)] if text else [] for text in normalized]
+
+        # Look up every distinct sentence or text once
+        found = {}
+        missing = []
+        for text_units in units:
+            for _, unit in text_units:
+                if unit not in found:
+                    found[unit] = self.cache.get(unit)
+                    if found[unit] is None:
+                        missing.append(unit)
+
+        if missing:
+            for unit, matches in zip(missing, self.check_uncached(missing)):
+                found[unit] = matches
+                self.cache.put(unit, matches)
+
+        results = []
+        for text, normal, text_units in zip(texts, normalized, units):
+            positions = None if text == normal else normalized_positions(text)
+            results.append([
+                self.relocate(match, offset, positions)
+                for offset, unit in text_units
+                for match in found[unit]
+            ])
+        return results
+
+    def relocate(self, match, offset, positions):
+        """Copy of a cached match, moved from its unit into the original text"""
+        match = copy.copy(match)
+        start = match.offset + offset
+        if positions is None:
+            match.offset = start
+        else:
+            end = start + match.errorLength
+            match.offset = positions[start]
+            match.errorLength = positions[end - 1] + 1 - match.offset if end > start else 0
+        return match
+
+    def check_uncached(self, texts):
+        """Check texts with LanguageTool in one round-trip, joined as paragraphs"""
+        if len(texts) == 1:
+            return [self.tool.check(texts[0])]
+
+        starts = []
+        position = 0
+        for text in texts:
+            starts.append(position)
+            position += len(text) + len(self.separator)
+
+        matches = self.tool.check(self.separator.join(texts))
+
+        results = [[] for _ in texts]
+        for match in matches:
+            index = bisect.bisect_right(starts, match.offset) - 1
+            start = starts[index]
+            end = start + len(texts[index])
+
+            # Drop matches that only exist because of the join
+            if match.offset >= end or match.offset + match.errorLength > end:
+                continue
+
+            match.offset -= start
+            results[index].append(match)
+
+        return results
+
+    def stats(self):
+        """Cache hit/miss counters, for tuning GRAMMAR_CACHE_SIZE"""
+        stats = self.cache.stats()
+        stats['sentence_cache'] = self.sentence_cache
+        return stats
+
+
+def get_grammar_checker():
+    """Get the process-wide GrammarChecker; LanguageTool starts on the first check"""
+    global _checker
+    if _checker is None:
+        _checker = GrammarChecker()
+    return _checker
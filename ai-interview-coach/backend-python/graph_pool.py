@@ -0,0 +1,111 @@
+import threading
+import weakref
+from contextlib import contextmanager
+
+
+class GraphPool:
+    """Pool of pre-initialized MediaPipe graph sets, reused across videos.
+
+    create_graphs is called to build one set (a tuple of graphs). A checked
+    out set is reset before it is handed out, so tracking state never leaks
+    from one video into the next. Up to size idle sets are kept; extra sets
+    created under higher concurrency are closed when they are returned.
+    """
+
+    def __init__(self, create_graphs, size=1):
+        self.create_graphs = create_graphs
+        self.size = max(1, size)
+        self._idle = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self.created = 0
+        self.reused = 0
+        # Closes the idle sets if the pool is dropped without close(), or at exit
+        self._finalizer = weakref.finalize(self, close_idle_graphs, self._idle)
+
+    def warm_up(self, count=None):
+        """Build count (default: all) pooled graph sets now instead of on first use"""
+        with self._lock:
+            missing = min(count or self.size, self.size) - len(self._idle)
+        graphs = [self._create() for _ in range(missing)]
+        for graph_set in graphs:
+            self.release(graph_set)
+
+    def _create(self):
+        with self._lock:
+            self.created += 1
+        return self.create_graphs()
+
+    def acquire(self):
+        """Take an idle graph set (reset for a new video) or build a new one"""
+        with self._lock:
+            graph_set = self._idle.pop() if self._idle else None
+            if graph_set is not None:
+                self.reused += 1
+
+        if graph_set is None:
+            return self._create()
+
+        try:
+            reset_graphs(graph_set)
+        except Exception as e:
+            print(f"Could not reset MediaPipe graphs, rebuilding: {e}")
+            close_graphs(graph_set)
+            return self._create()
+        return graph_set
+
+    def release(self, graph_set):
+        """Return a graph set to the pool, or close it if the pool is full"""
+        with self._lock:
+            if not self._closed and len(self._idle) < self.size:
+                self._idle.append(graph_set)
+                return
+        close_graphs(graph_set)
+
+    @contextmanager
+    def checkout(self):
+        """with pool.checkout() as (face_mesh, pose): ..."""
+        graph_set = self.acquire()
+        try:
+            yield graph_set
+        finally:
+            self.release(graph_set)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'idle': len(self._idle),
+                'created': self.created,
+                'reused': self.reused
+            }
+
+    def close(self):
+        """Close every idle graph set; sets still checked out close on release"""
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+        self._finalizer.detach()
+        for graph_set in idle:
+            close_graphs(graph_set)
+
+
+def reset_graphs(graph_set):
+    """Clear tracking state so the graphs can start on a new video"""
+    for graph in graph_set:
+        graph.reset()
+
+
+def close_idle_graphs(idle):
+    """Finalizer of a pool: close the sets in its idle list"""
+    while idle:
+        close_graphs(idle.pop())
+
+
+def close_graphs(graph_set):
+    for graph in graph_set:
+        try:
+            graph.close()
+        except Exception as e:
+            print(f"Error closing MediaPipe graph: {e}")
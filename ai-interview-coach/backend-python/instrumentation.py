@@ -0,0 +1,137 @@
+import contextlib
+import functools
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Set ANALYSIS_TIMINGS=1 to add a 'timings' block to every result
+TIMINGS_ENABLED = os.environ.get('ANALYSIS_TIMINGS', '0') not in ('', '0')
+
+# Set ANALYSIS_PROFILE_DIR to write one profile per analysis into that directory
+PROFILE_DIR = os.environ.get('ANALYSIS_PROFILE_DIR') or None
+
+# Shared do-nothing context manager, so disabled spans cost one function call
+_NO_SPAN = contextlib.nullcontext()
+
+
+class Span:
+    """Adds the seconds spent inside the with block to timings[stage]"""
+
+    __slots__ = ('timings', 'stage', 'start')
+
+    def __init__(self, timings, stage):
+        self.timings = timings
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        add_time(self.timings, self.stage, time.perf_counter() - self.start)
+        return False
+
+
+def span(timings, stage):
+    """with span(timings, 'extract_text'): ... (no-op when timings is None)"""
+    if timings is None:
+        return _NO_SPAN
+    return Span(timings, stage)
+
+
+def add_time(timings, stage, seconds):
+    """Add already measured seconds to a stage"""
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0) + seconds
+
+
+def start_timings(timings=None):
+    """The dict to collect stage timings in for one analysis, or None.
+
+    timings may be a dict to fill, True to collect into a new dict, or None
+    to collect only when ANALYSIS_TIMINGS is set.
+    """
+    if isinstance(timings, dict):
+        return timings
+    if timings or (timings is None and TIMINGS_ENABLED):
+        return {}
+    return None
+
+
+def attach_timings(result, timings):
+    """Return result with a rounded 'timings' block when timings were collected"""
+    if timings is None or not isinstance(result, dict):
+        return result
+    result = dict(result)
+    result['timings'] = {stage: round(seconds, 4) for stage, seconds in timings.items()}
+    return result
+
+
+def profiled(name):
+    """Decorator that writes a profile of every call to PROFILE_DIR.
+
+    Uses pyinstrument (a sampling profiler) when it is installed and cProfile
+    otherwise. Without ANALYSIS_PROFILE_DIR the function is returned as is.
+    """
+    def decorator(func):
+        if PROFILE_DIR is None:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def profile_path(name, extension):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    return os.path.join(PROFILE_DIR, f"{name}-{stamp}-{os.getpid()}-{threading.get_ident()}.{extension}")
+
+
+@contextlib.contextmanager
+def profile(name):
+    """Profile the with block and write the result to PROFILE_DIR"""
+    if PROFILE_DIR is None:
+        yield
+        return
+
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        Profiler = None
+
+    if Profiler is not None:
+        profiler = Profiler(interval=0.001)
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            try:
+                with open(profile_path(name, 'html'), 'w', encoding='utf-8') as f:
+                    f.write(profiler.output_html())
+            except Exception as e:
+                print(f"Could not write profile: {e}", file=sys.stderr)
+    else:
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # Only one cProfile can run at a time (e.g. concurrent server requests)
+            print(f"Profiler not started: {e}", file=sys.stderr)
+            profiler = None
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                try:
+                    profiler.dump_stats(profile_path(name, 'prof'))
+                except Exception as e:
+                    print(f"Could not write profile: {e}", file=sys.stderr)
@@ -0,0 +1,209 @@
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from functools import lru_cache
+
+# Export of the questions table: a .json file ([{"id": 1, "question": "..."}]
+# or {"1": "..."}) or an SQLite database with a questions(id, question) table
+DEFAULT_QUESTIONS_PATH = os.environ.get(
+    'QUESTION_INDEX_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'questions.json')
+)
+
+# Seconds between checks of the source file for changes
+REFRESH_INTERVAL = 5.0
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has
+have having he her here hers herself him himself his how i if in into is it its itself just me
+more most my myself no nor not now of off on once only or other our ours ourselves out over own
+same she should so some such than that the their theirs them themselves then there these they
+this those through to too under until up very was we were what when where which while who whom
+why will with would you your yours yourself yourselves
+""".split())
+
+# (suffix, shortest stem it may leave), longest suffix first. Short
+# derivational suffixes need a longer stem so "career" and "early" stay whole
+SUFFIXES = (
+    ('ational', 4), ('fulness', 4), ('iveness', 4), ('ization', 4), ('ations', 4), ('ements', 4),
+    ('ation', 4), ('ement', 4), ('ities', 4), ('ments', 4), ('ness', 5), ('ment', 4), ('able', 4),
+    ('ible', 4), ('ings', 3), ('ing', 3), ('ies', 3), ('ity', 4), ('ive', 4), ('ers', 5), ('ed', 3),
+    ('er', 5), ('ly', 5), ('es', 3), ('s', 3)
+)
+
+
+@lru_cache(maxsize=65536)
+def stem(word):
+    """Light suffix-stripping stemmer ("challenging", "challenges" -> "challeng")"""
+    for suffix, min_stem in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= min_stem:
+            # "business", "class"
+            if suffix == 's' and word.endswith('ss'):
+                break
+            word = word[:-len(suffix)]
+            if suffix == 'ies':
+                word += 'y'
+            break
+    # "describe" and "described" -> "describ"
+    if len(word) > 3 and word.endswith('e'):
+        word = word[:-1]
+    # "planned" -> "plan"
+    elif len(word) > 3 and word[-1] == word[-2] and word[-1] not in 'lsz':
+        word = word[:-1]
+    return word
+
+
+def normalize(text):
+    """Lowercase words of a text, for comparing question texts"""
+    return ' '.join(WORD_PATTERN.findall((text or '').lower()))
+
+
+def keywords(text):
+    """Stemmed keywords of a text, stopwords removed, in order"""
+    return [stem(word) for word in WORD_PATTERN.findall(text.lower()) if word not in STOPWORDS]
+
+
+class QuestionIndex:
+    """Keyword weights for every interview question, for relevance scoring.
+
+    Built once from an export of the questions table and rebuilt when the
+    file changes. Each question keeps its stemmed keywords weighted by
+    TF-IDF over all questions, so scoring an answer only has to tokenize
+    the answer.
+    """
+
+    def __init__(self, path=DEFAULT_QUESTIONS_PATH, refresh_interval=REFRESH_INTERVAL):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.questions = {}
+        # Normalized text of every question, to check callers' text against
+        self.texts = {}
+        self.weights = {}
+        self.idf = {}
+        self.default_idf = 1.0
+        self.mtime = None
+        self.last_check = 0.0
+        self.lock = threading.Lock()
+
+    def load_questions(self):
+        """{question id: text} from the source file"""
+        if self.path.endswith('.json'):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return {str(key): value for key, value in data.items()}
+            return {str(item['id']): item['question'] for item in data}
+
+        conn = sqlite3.connect(self.path)
+        try:
+            return {str(row[0]): row[1] for row in conn.execute("SELECT id, question FROM questions")}
+        finally:
+            conn.close()
+
+    def refresh(self, force=False):
+        """Rebuild the index if the source file changed since the last build"""
+        now = time.monotonic()
+        if not force and now - self.last_check < self.refresh_interval:
+            return
+        with self.lock:
+            self.last_check = now
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError:
+                # No export available: ad-hoc question text still works
+                return
+            if mtime == self.mtime and not force:
+                return
+            try:
+                self.build(self.load_questions())
+                self.mtime = mtime
+            except Exception as e:
+                print(f"Could not load question index from {self.path}: {e}", file=sys.stderr)
+
+    def build(self, questions):
+        """Compute IDF over all questions and the keyword weights of each one"""
+        terms = {question_id: keywords(text) for question_id, text in questions.items()}
+
+        document_frequency = {}
+        for question_terms in terms.values():
+            for term in set(question_terms):
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+
+        # Smoothed IDF; terms no question uses count like the rarest ones
+        count = len(terms)
+        idf = {
+            term: math.log((1 + count) / (1 + frequency)) + 1
+            for term, frequency in document_frequency.items()
+        }
+
+        self.questions = questions
+        self.texts = {question_id: normalize(text) for question_id, text in questions.items()}
+        self.idf = idf
+        self.default_idf = math.log(1 + count) + 1
+        self.weights = {question_id: self.weigh(question_terms) for question_id, question_terms in terms.items()}
+
+    def weigh(self, terms):
+        """TF-IDF weight of every distinct keyword"""
+        weights = {}
+        for term in terms:
+            weights[term] = weights.get(term, 0) + self.idf.get(term, self.default_idf)
+        return weights
+
+    def indexed_id(self, question_id, question=''):
+        """question_id as indexed, or None if it isn't indexed or the index
+        has a different text for it (edited or another database's question)"""
+        if question_id is None:
+            return None
+        question_id = str(question_id)
+        text = self.texts.get(question_id)
+        if text is None or (question and normalize(question) != text):
+            return None
+        return question_id
+
+    def question_weights(self, question_id=None, question=''):
+        """Keyword weights of an indexed question, or of the given question text"""
+        self.refresh()
+        question_id = self.indexed_id(question_id, question)
+        weights = self.weights.get(question_id) if question_id is not None else None
+        if weights is not None:
+            return weights
+        return self.weigh(keywords(question or ''))
+
+    def coverage(self, weights, answer_terms):
+        """Share (0-100) of the question's keyword weight found in the answer terms"""
+        if not weights:
+            return 50
+        total = sum(weights.values())
+        found = sum(weight for term, weight in weights.items() if term in answer_terms)
+        return min(found / total * 100, 100)
+
+    def relevance(self, answer, question_id=None, question=''):
+        """Relevance of an answer to a question (by ID when it is indexed)"""
+        return self.coverage(self.question_weights(question_id, question), set(keywords(answer)))
+
+    def stats(self):
+        return {'path': self.path, 'questions': len(self.questions), 'terms': len(self.idf)}
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_question_index():
+    """Get the process-wide QuestionIndex, built on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = QuestionIndex()
+                index.refresh(force=True)
+                _index = index
+    return _index
@@ -1,32 +1,72 @@
-import spacy
-import pdfplumber
-import docx
 import re
 import json
-import requests
-from collections import Counter
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from textblob import TextBlob
 import os
+import hashlib
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from skill_matcher import SkillMatcher
+from resume_cache import ResultCache, DEFAULT_CACHE_PATH
+from resume_sections import ResumeSections
+from resume_nlp import ResumeNLP, NLP_BATCH_SIZE
+from instrumentation import span, add_time, start_timings, attach_timings, profiled
 
-# Download NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
-    nltk.download('averaged_perceptron_tagger')
+# Bump when the analysis logic changes so cached results are recomputed
+ANALYZER_VERSION = '5'
+
+# Field extraction patterns, compiled once per process
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+PHONE_PATTERNS = [
+    re.compile(r'\+?\d{1,3}[-.\s]?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}'),
+    re.compile(r'\(\d{3}\)\s?\d{3}[-.\s]?\d{4}'),
+    re.compile(r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}')
+]
+# Fallback for resumes without a recognizable skills heading
+SKILLS_SECTION_PATTERN = re.compile(
+    r'(?:skills|technical skills|competencies)[:\s]*(.*?)(?:\n\n|\n[A-Z]|$)', re.IGNORECASE | re.DOTALL
+)
+SKILL_ITEM_SEPARATOR = re.compile(r'[,\n•\-*]')
+DEGREE_PATTERNS = [
+    re.compile(r'\b(bachelor|b\.?s\.?|b\.?a\.?|b\.?tech|b\.?e)\b'),
+    re.compile(r'\b(master|m\.?s\.?|m\.?a\.?|m\.?tech|m\.?e)\b'),
+    re.compile(r'\b(ph\.?d|doctorate|doctoral)\b'),
+    re.compile(r'\b(diploma|certificate)\b')
+]
+INSTITUTION_KEYWORDS = ('university', 'college', 'institute', 'school')
+GPA_PATTERN = re.compile(r'\bgpa\s*[:]?\s*(\d+\.\d+)\b')
+EXPERIENCE_PATTERNS = [
+    re.compile(r'(\d+)\s*(?:year|yr)s?\s*(?:of)?\s*experience'),
+    re.compile(r'experience\s*(?:of)?\s*(\d+)\s*(?:year|yr)s?'),
+    re.compile(r'(\d+)\+?\s*(?:year|yr)s?')
+]
+YEAR_PATTERN = re.compile(r'\b(19|20)\d{2}\b')
+CERT_PATTERNS = [
+    re.compile(r'\b(certified|certification|certificate)\b.*?[\n,]', re.IGNORECASE),
+    # Look for acronyms like AWS-CSA, PMP, etc.
+    re.compile(r'\b[A-Z]{2,}[\s\-]?[A-Z0-9]{2,}\b', re.IGNORECASE)
+]
+COMMON_CERTS = ['AWS', 'Azure', 'Google Cloud', 'PMP', 'Scrum', 'CISSP', 'CEH',
+                'CCNA', 'OCP', 'MCSE', 'CISM', 'ITIL']
+
+def extract_pdf_pages(file_path, start, end):
+    """Extract the text of PDF pages [start, end), runs in pool workers"""
+    import pdfplumber
+    
+    texts = []
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages[start:end]:
+            texts.append(page.extract_text() or "")
+            # Free the parsed page objects as we go
+            page.flush_cache()
+    return texts
 
 class ResumeAnalyzer:
-    def __init__(self):
-        # Use small English model (faster, free)
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except:
-            # If spaCy model not available, use simple tokenizer
-            self.nlp = None
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH, use_cache=True,
+                 max_pages=None, max_chars=None, parallel_page_threshold=8, page_workers=None,
+                 nlp_batch_size=NLP_BATCH_SIZE):
+        # Batched sentiment and entity extraction; models load on first use
+        self.nlp_stage = ResumeNLP(batch_size=nlp_batch_size)
         
         # Comprehensive skills database
         self.skills_db = [
@@ -72,104 +112,331 @@ class ResumeAnalyzer:
             'Business Analyst': ['data analysis', 'sql', 'excel', 'requirements gathering', 'documentation']
         }
         
+        # Programming languages
+        self.programming_keywords = [
+            'python', 'java', 'javascript', 'c++', 'c#', 'php', 'ruby', 'swift',
+            'kotlin', 'go', 'rust', 'typescript', 'scala', 'perl', 'r',
+            'html', 'css', 'sql', 'nosql', 'bash', 'shell'
+        ]
+        
         # Education keywords
         self.education_keywords = [
             'bachelor', 'master', 'phd', 'degree', 'university', 'college',
             'graduate', 'undergraduate', 'diploma', 'certificate', 'course'
         ]
+        
+        # Build the keyword matcher once for skills, languages and categories
+        self.matcher = self.build_matcher()
+        
+        # Text extraction limits; long PDFs are split over a process pool
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.parallel_page_threshold = parallel_page_threshold
+        self.page_workers = page_workers or os.cpu_count() or 1
+        self._page_pool = None
+        
+        # Results cache keyed on file content + taxonomy version
+        self.cache = ResultCache(cache_path) if use_cache else None
+    
+    @property
+    def nlp(self):
+        """Small English spaCy model (faster, free), or None if it isn't installed"""
+        return self.nlp_stage.nlp
+    
+    def taxonomy_version(self):
+        """Hash of everything that affects the analysis result"""
+        config = {
+            'version': ANALYZER_VERSION,
+            'skills_db': self.skills_db,
+            'programming_keywords': self.programming_keywords,
+            'job_categories': self.job_categories,
+            'education_keywords': self.education_keywords,
+            'max_pages': self.max_pages,
+            'max_chars': self.max_chars
+        }
+        return hashlib.sha1(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def build_matcher(self):
+        """Build one keyword matcher for all skill, language and category keywords"""
+        matcher = SkillMatcher()
+        matcher.add_all(self.skills_db, 'skill')
+        matcher.add_all(self.programming_keywords, 'language')
+        for category, keywords in self.job_categories.items():
+            matcher.add_all(keywords, ('category', category))
+        matcher.build()
+        return matcher
     
     def extract_text(self, file_path):
         """Extract text from PDF or DOCX files"""
-        text = ""
+        parts = []
         try:
-            if file_path.endswith('.pdf'):
-                with pdfplumber.open(file_path) as pdf:
-                    for page in pdf.pages:
-                        text += page.extract_text() or ""
-            elif file_path.endswith('.docx'):
-                doc = docx.Document(file_path)
-                text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-            else:
-                # Try to read as text file
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    text = f.read()
+            for chunk in self.iter_text(file_path):
+                parts.append(chunk)
         except Exception as e:
             print(f"Error extracting text: {e}")
         
-        return text
+        return "\n".join(parts)
+    
+    def iter_text(self, file_path):
+        """Yield the resume text chunk by chunk (one chunk per PDF page)"""
+        if file_path.endswith('.pdf'):
+            chunks = self.iter_pdf_pages(file_path)
+        elif file_path.endswith('.docx'):
+            import docx
+            doc = docx.Document(file_path)
+            chunks = iter(["\n".join([paragraph.text for paragraph in doc.paragraphs])])
+        else:
+            # Try to read as text file
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                chunks = iter([f.read()])
+        
+        # Apply the character cap across all chunks
+        remaining = self.max_chars
+        for chunk in chunks:
+            if remaining is not None:
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+            yield chunk
+            if remaining is not None and remaining <= 0:
+                break
+    
+    def iter_pdf_pages(self, file_path):
+        """Yield PDF page text in order, using a process pool for long documents"""
+        import pdfplumber
+        
+        with pdfplumber.open(file_path) as pdf:
+            page_count = len(pdf.pages)
+            if self.max_pages is not None:
+                page_count = min(page_count, self.max_pages)
+            
+            if page_count < self.parallel_page_threshold or self.page_workers < 2:
+                for page in pdf.pages[:page_count]:
+                    yield page.extract_text() or ""
+                    page.flush_cache()
+                return
+        
+        # Small page ranges keep results streaming back in order
+        batch_size = max(1, min(4, page_count // self.page_workers))
+        ranges = [(start, min(start + batch_size, page_count)) for start in range(0, page_count, batch_size)]
+        
+        # Workers start on demand, so keeping at most this many batches in
+        # flight also caps the processes a document can start
+        in_flight = min(self.page_workers, len(ranges))
+        pool = self.page_pool()
+        pending = deque()
+        try:
+            for start, end in ranges:
+                pending.append(pool.submit(extract_pdf_pages, file_path, start, end))
+                if len(pending) >= in_flight:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            # Stop pending work if the caller exits early
+            for future in pending:
+                future.cancel()
+    
+    def page_pool(self):
+        """Long-lived process pool for PDF pages.
+        
+        Workers are spawned rather than forked, so they are not copies of a
+        multi-threaded server with every model loaded.
+        """
+        if self._page_pool is None:
+            self._page_pool = ProcessPoolExecutor(
+                max_workers=self.page_workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._page_pool
+    
+    def close(self):
+        """Shut down the PDF page pool"""
+        if self._page_pool is not None:
+            self._page_pool.shutdown(cancel_futures=True)
+            self._page_pool = None
+    
+    @profiled('resume')
+    def analyze_resume(self, file_path, timings=None):
+        """Main analysis function.
+        
+        timings may be True or a dict to add per-stage seconds to the result
+        (see instrumentation.start_timings).
+        """
+        timings = start_timings(timings)
+        result = self.run_batch([file_path], [timings])[0]
+        return attach_timings(result, timings)
+    
+    @profiled('resume_batch')
+    def analyze_resumes(self, file_paths, timings=None):
+        """Analyze many resumes, running the NLP stage once per batch of documents.
+        
+        Returns one result per path, in order. With timings=True every result
+        gets its own timings block; the batched 'nlp' stage is split evenly.
+        """
+        results = []
+        batch_size = max(1, self.nlp_stage.batch_size)
+        for start in range(0, len(file_paths), batch_size):
+            batch = file_paths[start:start + batch_size]
+            batch_timings = [start_timings(True if timings else None) for _ in batch]
+            batch_results = self.run_batch(batch, batch_timings)
+            results.extend(
+                attach_timings(result, stages) for result, stages in zip(batch_results, batch_timings)
+            )
+        return results
     
-    def analyze_resume(self, file_path):
-        """Main analysis function"""
+    def run_batch(self, file_paths, timings_list):
+        """Extract every resume, run the shared NLP stage, then finish each one"""
+        jobs = [self.prepare(file_path, timings) for file_path, timings in zip(file_paths, timings_list)]
+        pending = [job for job in jobs if 'result' not in job]
+        
+        if pending:
+            start = time.perf_counter()
+            try:
+                nlp_results = self.nlp_stage.analyze([self.nlp_document(job) for job in pending])
+            except Exception as e:
+                print(f"NLP stage error: {e}")
+                nlp_results = [{'polarity': None, 'person': None, 'organizations': []} for _ in pending]
+            elapsed = time.perf_counter() - start
+            
+            for job, nlp_result in zip(pending, nlp_results):
+                add_time(job['timings'], 'nlp', elapsed / len(pending))
+                job['result'] = self.finish(job, nlp_result)
+        
+        return [job['result'] for job in jobs]
+    
+    def prepare(self, file_path, timings=None):
+        """Cache lookup and text extraction for one resume.
+        
+        Returns a job dict; it already has a 'result' for cache hits and errors.
+        """
+        job = {'file_path': file_path, 'timings': timings}
         try:
+            # Re-uploads of the same file come straight from the cache
+            job['cache_key'] = None
+            if self.cache is not None:
+                with span(timings, 'cache_lookup'):
+                    job['cache_key'] = self.cache.make_key(file_path, self.taxonomy_version())
+                    cached = self.cache.get(job['cache_key'])
+                if cached is not None:
+                    job['result'] = cached
+                    return job
+            
             # Extract text from resume
-            text = self.extract_text(file_path)
+            with span(timings, 'extract_text'):
+                text = self.extract_text(file_path)
             
             if not text or len(text.strip()) < 50:
-                return {
+                job['result'] = {
                     'success': False,
                     'error': 'Resume text too short or could not be extracted'
                 }
+                return job
             
             print(f"Extracted text length: {len(text)} characters")
             
-            # Extract basic information
-            name = self.extract_name(text)
-            email = self.extract_email(text)
-            phone = self.extract_phone(text)
-            
-            # Extract skills using multiple methods
-            skills = self.extract_skills(text)
+            # Split into sections once; each extractor only reads its own
+            with span(timings, 'parse_sections'):
+                job['sections'] = ResumeSections(text)
+            job['text'] = text
+            return job
             
-            # Extract programming languages
-            programming_languages = self.extract_programming_languages(text)
-            
-            # Extract education
-            education = self.extract_education(text)
-            
-            # Extract experience
-            experience_years = self.extract_experience(text)
-            
-            # Extract certifications
-            certifications = self.extract_certifications(text)
+        except Exception as e:
+            print(f"Analysis error: {e}")
+            job['result'] = {
+                'success': False,
+                'error': str(e)
+            }
+            return job
+    
+    def nlp_document(self, job):
+        """What the NLP stage needs from a prepared resume"""
+        sections = job['sections']
+        return {
+            'text': job['text'],
+            # Names are looked for in the header, organizations in experience and education
+            'entity_text': sections.get('header', 'experience', 'education'),
+            'header_length': len(sections.sections.get('header', ''))
+        }
+    
+    def finish(self, job, nlp_result):
+        """Field extraction, scoring and the report for a prepared resume"""
+        timings = job['timings']
+        text = job['text']
+        sections = job['sections']
+        try:
+            with span(timings, 'extract_fields'):
+                # Extract basic information (a PERSON entity wins over the heuristic)
+                name = nlp_result['person'] or self.extract_name(text)
+                email = self.extract_email(text)
+                phone = self.extract_phone(text)
+                
+                # Extract education
+                education = self.extract_education(text, sections)
+                
+                # Extract experience
+                experience_years = self.extract_experience(text, sections)
+                
+                # Extract certifications
+                certifications = self.extract_certifications(text, sections)
             
-            # Determine job categories
-            job_categories = self.classify_job_categories(skills + programming_languages)
+            with span(timings, 'extract_skills'):
+                # Find all known keywords in a single pass
+                keyword_matches = self.matcher.find(text)
+                
+                # Extract skills using multiple methods
+                skills = self.extract_skills(text, keyword_matches, sections)
+                
+                # Extract programming languages
+                programming_languages = self.extract_programming_languages(text, keyword_matches)
+                
+                # Determine job categories
+                job_categories = self.classify_job_categories(skills + programming_languages)
             
             # Calculate score
-            score = self.calculate_score(skills, programming_languages, education, experience_years)
+            with span(timings, 'score'):
+                score = self.calculate_score(
+                    skills, programming_languages, education, experience_years, certifications
+                )
             
-            # Sentiment analysis (confidence level)
-            confidence_score = self.analyze_confidence(text)
+            # Sentiment analysis (confidence level), from the batched NLP stage
+            confidence_score = self.confidence_from_polarity(nlp_result['polarity'])
             
-            # Generate detailed analysis
-            analysis = self.generate_analysis(
-                skills, programming_languages, education, 
-                experience_years, job_categories, score, confidence_score
-            )
+            with span(timings, 'report'):
+                # Generate detailed analysis
+                analysis = self.generate_analysis(
+                    skills, programming_languages, education, 
+                    experience_years, job_categories, score, confidence_score
+                )
+                
+                # Generate recommendations
+                recommendations = self.generate_recommendations(skills, programming_languages, score)
+                
+                result = {
+                    'success': True,
+                    'basic_info': {
+                        'name': name,
+                        'email': email,
+                        'phone': phone
+                    },
+                    'skills': skills[:15],  # Limit to top 15 skills
+                    'programming_languages': programming_languages,
+                    'education': education,
+                    'experience_years': experience_years,
+                    'certifications': certifications,
+                    'organizations': nlp_result['organizations'],
+                    'job_categories': job_categories[:3],  # Top 3 categories
+                    'score': min(score, 100),  # Cap at 100
+                    'confidence_score': confidence_score,
+                    'analysis': analysis,
+                    'recommendations': recommendations,
+                    'word_count': len(text.split()),
+                    'text_preview': text[:500] + "..." if len(text) > 500 else text
+                }
             
-            # Generate recommendations
-            recommendations = self.generate_recommendations(skills, programming_languages, score)
+            if job['cache_key'] is not None:
+                with span(timings, 'cache_store'):
+                    self.cache.put(job['cache_key'], result)
             
-            return {
-                'success': True,
-                'basic_info': {
-                    'name': name,
-                    'email': email,
-                    'phone': phone
-                },
-                'skills': skills[:15],  # Limit to top 15 skills
-                'programming_languages': programming_languages,
-                'education': education,
-                'experience_years': experience_years,
-                'certifications': certifications,
-                'job_categories': job_categories[:3],  # Top 3 categories
-                'score': min(score, 100),  # Cap at 100
-                'confidence_score': confidence_score,
-                'analysis': analysis,
-                'recommendations': recommendations,
-                'word_count': len(text.split()),
-                'text_preview': text[:500] + "..." if len(text) > 500 else text
-            }
+            return result
             
         except Exception as e:
             print(f"Analysis error: {e}")
@@ -193,122 +460,100 @@ class ResumeAnalyzer:
     
     def extract_email(self, text):
         """Extract email from text"""
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        emails = re.findall(email_pattern, text)
-        return emails[0] if emails else "Not Found"
+        email = EMAIL_PATTERN.search(text)
+        return email.group(0) if email else "Not Found"
     
     def extract_phone(self, text):
         """Extract phone number from text"""
-        phone_patterns = [
-            r'\+?\d{1,3}[-.\s]?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}',
-            r'\(\d{3}\)\s?\d{3}[-.\s]?\d{4}',
-            r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}'
-        ]
-        
-        for pattern in phone_patterns:
-            phones = re.findall(pattern, text)
-            if phones:
-                return phones[0]
+        for pattern in PHONE_PATTERNS:
+            phone = pattern.search(text)
+            if phone:
+                return phone.group(0)
         return "Not Found"
     
-    def extract_skills(self, text):
+    def extract_skills(self, text, keyword_matches=None, sections=None):
         """Extract skills from resume text"""
-        text_lower = text.lower()
-        found_skills = []
+        if keyword_matches is None:
+            keyword_matches = self.matcher.find(text)
+        if sections is None:
+            sections = ResumeSections(text)
         
         # Method 1: Direct keyword matching
-        for skill in self.skills_db:
-            if skill.lower() in text_lower:
-                found_skills.append(skill.title())
+        found_skills = [skill.title() for skill in keyword_matches.get('skill', [])]
         
         # Method 2: Look for skills section
-        skills_section_pattern = r'(?:skills|technical skills|competencies)[:\s]*(.*?)(?:\n\n|\n[A-Z]|$)'
-        skills_section_match = re.search(skills_section_pattern, text, re.IGNORECASE | re.DOTALL)
+        skills_section = None
+        if sections.has('skills'):
+            skills_section = sections.get('skills')
+        else:
+            skills_section_match = SKILLS_SECTION_PATTERN.search(text)
+            if skills_section_match:
+                skills_section = skills_section_match.group(1)
         
-        if skills_section_match:
-            skills_section = skills_section_match.group(1)
+        if skills_section:
             # Extract individual skills from section
-            skill_items = re.split(r'[,\n•\-*]', skills_section)
+            skill_items = SKILL_ITEM_SEPARATOR.split(skills_section)
             for item in skill_items:
                 item_clean = item.strip()
                 if item_clean and len(item_clean.split()) <= 3:
                     found_skills.append(item_clean.title())
         
         # Remove duplicates and return
-        return list(set(found_skills))
+        return list(dict.fromkeys(found_skills))
     
-    def extract_programming_languages(self, text):
+    def extract_programming_languages(self, text, keyword_matches=None):
         """Extract programming languages"""
-        programming_keywords = [
-            'python', 'java', 'javascript', 'c++', 'c#', 'php', 'ruby', 'swift',
-            'kotlin', 'go', 'rust', 'typescript', 'scala', 'perl', 'r',
-            'html', 'css', 'sql', 'nosql', 'bash', 'shell'
-        ]
-        
-        text_lower = text.lower()
-        languages = []
-        
-        for lang in programming_keywords:
-            if lang in text_lower:
-                languages.append(lang.title())
+        if keyword_matches is None:
+            keyword_matches = self.matcher.find(text)
         
-        return list(set(languages))
+        return [lang.title() for lang in keyword_matches.get('language', [])]
     
-    def extract_education(self, text):
-        """Extract education information"""
+    def extract_education(self, text, sections=None):
+        """Extract education information (from the education section when there is one)"""
         education_info = {
             'degrees': [],
             'institutions': [],
             'gpa': None
         }
         
-        # Degree patterns
-        degree_patterns = [
-            r'\b(bachelor|b\.?s\.?|b\.?a\.?|b\.?tech|b\.?e)\b',
-            r'\b(master|m\.?s\.?|m\.?a\.?|m\.?tech|m\.?e)\b',
-            r'\b(ph\.?d|doctorate|doctoral)\b',
-            r'\b(diploma|certificate)\b'
-        ]
-        
+        if sections is None:
+            sections = ResumeSections(text)
+        text = sections.get('education')
         text_lower = text.lower()
         
-        for pattern in degree_patterns:
-            matches = re.findall(pattern, text_lower)
+        # Degree patterns
+        for pattern in DEGREE_PATTERNS:
+            matches = pattern.findall(text_lower)
             if matches:
                 education_info['degrees'].extend([m.title() for m in matches])
         
         # Institution patterns
-        institution_keywords = ['university', 'college', 'institute', 'school']
         lines = text.split('\n')
         
         for line in lines:
             line_lower = line.lower()
-            if any(keyword in line_lower for keyword in institution_keywords):
+            if any(keyword in line_lower for keyword in INSTITUTION_KEYWORDS):
                 # Check if this line might be an institution name
                 if len(line.strip()) > 5 and len(line.strip().split()) <= 5:
                     education_info['institutions'].append(line.strip())
         
         # GPA pattern
-        gpa_pattern = r'\bgpa\s*[:]?\s*(\d+\.\d+)\b'
-        gpa_match = re.search(gpa_pattern, text_lower)
+        gpa_match = GPA_PATTERN.search(text_lower)
         if gpa_match:
             education_info['gpa'] = float(gpa_match.group(1))
         
         return education_info
     
-    def extract_experience(self, text):
-        """Extract years of experience"""
-        # Pattern for years of experience
-        exp_patterns = [
-            r'(\d+)\s*(?:year|yr)s?\s*(?:of)?\s*experience',
-            r'experience\s*(?:of)?\s*(\d+)\s*(?:year|yr)s?',
-            r'(\d+)\+?\s*(?:year|yr)s?'
-        ]
-        
+    def extract_experience(self, text, sections=None):
+        """Extract years of experience (from the intro, summary and experience sections)"""
+        if sections is None:
+            sections = ResumeSections(text)
+        text = sections.get('header', 'summary', 'experience')
         text_lower = text.lower()
         
-        for pattern in exp_patterns:
-            matches = re.findall(pattern, text_lower)
+        # Pattern for years of experience
+        for pattern in EXPERIENCE_PATTERNS:
+            matches = pattern.findall(text_lower)
             if matches:
                 try:
                     return int(matches[0])
@@ -316,44 +561,46 @@ class ResumeAnalyzer:
                     continue
         
         # Fallback: count years mentioned
-        year_matches = re.findall(r'\b(19|20)\d{2}\b', text)
+        year_matches = YEAR_PATTERN.findall(text)
         if year_matches:
             return max(1, len(year_matches) // 2)
         
         return 0
     
-    def extract_certifications(self, text):
-        """Extract certifications"""
-        cert_patterns = [
-            r'\b(certified|certification|certificate)\b.*?[\n,]',
-            r'\b[A-Z]{2,}[\s\-]?[A-Z0-9]{2,}\b'  # Look for acronyms like AWS-CSA, PMP, etc.
-        ]
+    def extract_certifications(self, text, sections=None):
+        """Extract certifications (from the certifications section when there is one)"""
+        if sections is None:
+            sections = ResumeSections(text)
+        text = sections.get('certifications')
         
         certifications = []
-        for pattern in cert_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in CERT_PATTERNS:
+            matches = pattern.findall(text)
             if matches:
                 certifications.extend([m.strip() for m in matches if len(m.strip()) > 3])
         
         # Common certifications
-        common_certs = ['AWS', 'Azure', 'Google Cloud', 'PMP', 'Scrum', 'CISSP', 'CEH', 
-                       'CCNA', 'OCP', 'MCSE', 'CISM', 'ITIL']
-        
         text_upper = text.upper()
-        for cert in common_certs:
+        for cert in COMMON_CERTS:
             if cert.upper() in text_upper:
                 certifications.append(cert)
         
-        return list(set(certifications))[:10]  # Limit to 10
+        return list(dict.fromkeys(certifications))[:10]  # Limit to 10
     
     def classify_job_categories(self, skills):
         """Classify resume into job categories based on skills"""
         category_scores = {}
+        category_skills = {}
         
-        for category, keywords in self.job_categories.items():
-            score = sum(1 for skill in skills if any(keyword in skill.lower() for keyword in keywords))
-            if score > 0:
-                category_scores[category] = score
+        # Count each skill once per category whose keywords it contains
+        for skill in skills:
+            for tag in self.matcher.find(skill):
+                if isinstance(tag, tuple) and tag[0] == 'category':
+                    category_skills.setdefault(tag[1], []).append(skill)
+        
+        for category in self.job_categories:
+            if category in category_skills:
+                category_scores[category] = len(category_skills[category])
         
         # Sort categories by score
         sorted_categories = sorted(category_scores.items(), key=lambda x: x[1], reverse=True)
@@ -365,12 +612,12 @@ class ResumeAnalyzer:
             result.append({
                 'category': category,
                 'match_score': round(match_percentage, 1),
-                'matched_skills': [s for s in skills if any(k in s.lower() for k in self.job_categories[category])]
+                'matched_skills': category_skills[category]
             })
         
         return result
     
-    def calculate_score(self, skills, programming_langs, education, experience):
+    def calculate_score(self, skills, programming_langs, education, experience, certifications):
         """Calculate resume score (0-100)"""
         score = 0
         
@@ -408,7 +655,7 @@ class ResumeAnalyzer:
         score += exp_score
         
         # Bonus for certifications (up to 10 points)
-        cert_bonus = min(len(self.extract_certifications(" ".join(skills))) * 2, 10)
+        cert_bonus = min(len(certifications) * 2, 10)
         score += cert_bonus
         
         return min(score, 100)
@@ -416,15 +663,18 @@ class ResumeAnalyzer:
     def analyze_confidence(self, text):
         """Analyze confidence level from resume text"""
         try:
-            # Use TextBlob for sentiment analysis
-            blob = TextBlob(text)
-            sentiment = blob.sentiment.polarity  # -1 to 1
-            
-            # Convert to confidence score (0-100)
-            confidence = 50 + (sentiment * 50)
-            return max(0, min(100, confidence))
-        except:
+            # TextBlob sentiment, with the analyzer shared across documents
+            polarity = self.nlp_stage.polarity(text)
+        except Exception:
+            polarity = None
+        return self.confidence_from_polarity(polarity)
+    
+    def confidence_from_polarity(self, polarity):
+        """Convert sentiment polarity (-1 to 1) to a confidence score (0-100)"""
+        if polarity is None:
             return 70  # Default confidence
+        confidence = 50 + (polarity * 50)
+        return max(0, min(100, confidence))
     
     def generate_analysis(self, skills, programming_langs, education, experience, job_categories, score, confidence):
         """Generate detailed analysis text"""
@@ -499,10 +749,18 @@ class ResumeAnalyzer:
         
         return recommendations[:5]  # Return top 5 recommendations
 
+_default_analyzer = None
+
+def get_analyzer():
+    """Get a shared ResumeAnalyzer, created on first use"""
+    global _default_analyzer
+    if _default_analyzer is None:
+        _default_analyzer = ResumeAnalyzer()
+    return _default_analyzer
+
 def analyze_resume_file(file_path):
     """Main function to analyze a resume file"""
-    analyzer = ResumeAnalyzer()
-    result = analyzer.analyze_resume(file_path)
+    result = get_analyzer().analyze_resume(file_path)
     return result
 
 if __name__ == "__main__":
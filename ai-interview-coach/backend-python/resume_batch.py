@@ -0,0 +1,140 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+# One warm analyzer per worker process
+_analyzer = None
+
+
+def _init_worker(use_cache):
+    global _analyzer
+    # Results are written by the parent as JSON Lines, keep worker prints off stdout
+    sys.stdout = sys.stderr
+
+    from resume_ai import ResumeAnalyzer
+    # Files are already spread over processes, so no nested page pools
+    _analyzer = ResumeAnalyzer(use_cache=use_cache, page_workers=1)
+
+
+def _analyze_chunk(file_paths):
+    """Analyze a chunk of files together so the NLP stage runs batched"""
+    start = time.perf_counter()
+    results = _analyzer.analyze_resumes(file_paths, timings=True)
+    total = (time.perf_counter() - start) / len(file_paths)
+
+    analyzed = []
+    for file_path, result in zip(file_paths, results):
+        timings = result.pop('timings', {})
+        timings['total'] = total
+        analyzed.append((file_path, result, timings))
+    return analyzed
+
+
+def collect_files(sources):
+    """Expand directories, glob patterns and manifest files into resume paths.
+
+    Manifests are either @list.txt (one path per line) or a .jsonl file
+    with a 'file_path' field per line.
+    """
+    files = []
+
+    for source in sources:
+        if os.path.isdir(source):
+            for root, _, names in os.walk(source):
+                for name in sorted(names):
+                    if name.lower().endswith(RESUME_EXTENSIONS):
+                        files.append(os.path.join(root, name))
+        elif source.endswith('.jsonl') and os.path.isfile(source):
+            with open(source, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        files.append(json.loads(line)['file_path'])
+        elif source.startswith('@'):
+            # @list.txt: manifest with one path per line
+            with open(source[1:], 'r', encoding='utf-8') as f:
+                files.extend(line.strip() for line in f if line.strip())
+        elif os.path.isfile(source):
+            files.append(source)
+        else:
+            files.extend(sorted(glob.glob(source, recursive=True)))
+
+    # Keep the first occurrence of each file
+    return list(dict.fromkeys(files))
+
+
+def analyze_files(files, workers=None, use_cache=True, batch_size=8):
+    """Analyze files over a process pool, yielding (path, result, timings) as each chunk finishes.
+
+    Each worker gets batch_size files at a time and runs them through the
+    NLP stage together.
+    """
+    batch_size = max(1, batch_size)
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(use_cache,)
+    ) as executor:
+        futures = [
+            executor.submit(_analyze_chunk, files[start:start + batch_size])
+            for start in range(0, len(files), batch_size)
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Analyze many resumes in parallel')
+    parser.add_argument('sources', nargs='+',
+                        help='Directories, glob patterns, .jsonl manifests or @list.txt files')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--output', default=None, help='JSON Lines output file (default: stdout)')
+    parser.add_argument('--no-cache', action='store_true', help='Re-analyze even if a cached result exists')
+    parser.add_argument('--batch-size', type=int, default=8,
+                        help='Resumes each worker runs through the NLP stage together (default: 8)')
+    args = parser.parse_args(argv)
+
+    files = collect_files(args.sources)
+    if not files:
+        print("No resume files found", file=sys.stderr)
+        return 1
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    stage_totals = {}
+    failed = 0
+    start = time.perf_counter()
+
+    try:
+        for file_path, result, timings in analyze_files(files, args.workers, not args.no_cache, args.batch_size):
+            out.write(json.dumps({'file': file_path, 'result': result, 'timings': timings}) + "\n")
+            out.flush()
+
+            if not result.get('success'):
+                failed += 1
+            for stage, seconds in timings.items():
+                stage_totals[stage] = stage_totals.get(stage, 0) + seconds
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        'files': len(files),
+        'failed': failed,
+        'elapsed_seconds': round(elapsed, 3),
+        'files_per_second': round(len(files) / elapsed, 2) if elapsed > 0 else 0,
+        'mean_stage_seconds': {
+            stage: round(total / len(files), 4) for stage, total in stage_totals.items()
+        }
+    }
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
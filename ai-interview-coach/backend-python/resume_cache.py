@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    'RESUME_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'resume_cache.sqlite')
+)
+
+
+def file_hash(file_path, chunk_size=1024 * 1024):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Two-tier cache for analysis results: in-memory LRU in front of SQLite.
+
+    Keys combine the file's content hash with the analyzer's taxonomy version,
+    so entries stop matching as soon as the skills or scoring config change.
+    Pass path=None for a memory-only cache.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_memory_items=256, max_disk_items=10000):
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.conn = None
+
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                self.conn = sqlite3.connect(path, check_same_thread=False)
+                self.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS results ("
+                    "key TEXT PRIMARY KEY, result TEXT NOT NULL, last_used REAL NOT NULL)"
+                )
+                self.conn.commit()
+            except sqlite3.Error as e:
+                # Still usable as a memory-only cache
+                print(f"Could not open result cache at {path}: {e}")
+                self.conn = None
+
+    def make_key(self, file_path, version):
+        return f"{file_hash(file_path)}:{version}"
+
+    def get(self, key):
+        """Return the cached result for key, or None"""
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return json.loads(self.memory[key])
+
+            if self.conn is not None:
+                try:
+                    row = self.conn.execute(
+                        "SELECT result FROM results WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row:
+                        self.conn.execute(
+                            "UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key)
+                        )
+                        self.conn.commit()
+                        self._remember(key, row[0])
+                        self.hits += 1
+                        return json.loads(row[0])
+                except sqlite3.Error as e:
+                    print(f"Result cache read error: {e}")
+
+            self.misses += 1
+            return None
+
+    def put(self, key, result):
+        """Store a result in both tiers"""
+        payload = json.dumps(result)
+        with self.lock:
+            self._remember(key, payload)
+
+            if self.conn is not None:
+                try:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO results (key, result, last_used) VALUES (?, ?, ?)",
+                        (key, payload, time.time())
+                    )
+                    # Drop the least recently used rows beyond the size limit
+                    self.conn.execute(
+                        "DELETE FROM results WHERE key IN ("
+                        "SELECT key FROM results ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                        (self.max_disk_items,)
+                    )
+                    self.conn.commit()
+                except sqlite3.Error as e:
+                    print(f"Result cache write error: {e}")
+
+    def _remember(self, key, payload):
+        self.memory[key] = payload
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_items:
+            self.memory.popitem(last=False)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'memory_items': len(self.memory)}
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,94 @@
+import sys
+import threading
+
+NLP_MODEL = 'en_core_web_sm'
+
+# Only named entities are used. The shared tok2vec layer is dropped after
+# loading unless NER listens to it (en_core_web_sm's NER has its own)
+NLP_EXCLUDE = ['tagger', 'morphologizer', 'parser', 'senter', 'attribute_ruler', 'lemmatizer']
+
+# Documents sent through spaCy per batch, and the characters kept per document
+NLP_BATCH_SIZE = 32
+NLP_MAX_CHARS = 20000
+
+
+class ResumeNLP:
+    """Batched NLP stage: sentiment and named entities for many resumes at once.
+
+    The spaCy model (with only the components needed for NER) and the
+    TextBlob sentiment analyzer are loaded on first use and shared by every
+    document. Without spaCy or the model, entities are simply left empty.
+    """
+
+    def __init__(self, model=NLP_MODEL, batch_size=NLP_BATCH_SIZE, max_chars=NLP_MAX_CHARS):
+        self.model = model
+        self.batch_size = batch_size
+        self.max_chars = max_chars
+        self._nlp = None
+        self._nlp_loaded = False
+        self._sentiment = None
+        self._lock = threading.Lock()
+
+    @property
+    def nlp(self):
+        """The spaCy pipeline, or None if spaCy or the model isn't installed"""
+        if not self._nlp_loaded:
+            with self._lock:
+                if not self._nlp_loaded:
+                    try:
+                        import spacy
+                        nlp = spacy.load(self.model, exclude=NLP_EXCLUDE)
+                        if 'tok2vec' in nlp.pipe_names and 'ner' not in nlp.get_pipe('tok2vec').listening_components:
+                            nlp.remove_pipe('tok2vec')
+                        self._nlp = nlp
+                    except Exception as e:
+                        print(f"spaCy model not available, skipping entity extraction: {e}", file=sys.stderr)
+                        self._nlp = None
+                    self._nlp_loaded = True
+        return self._nlp
+
+    @property
+    def sentiment(self):
+        """One shared TextBlob pattern analyzer (what TextBlob(text).sentiment uses)"""
+        if self._sentiment is None:
+            from textblob.en.sentiments import PatternAnalyzer
+            self._sentiment = PatternAnalyzer()
+        return self._sentiment
+
+    def polarity(self, text):
+        """Sentiment polarity from -1 to 1"""
+        return self.sentiment.analyze(text).polarity
+
+    def analyze(self, documents):
+        """Sentiment and entities for a list of documents.
+
+        Each document is a dict with 'text' (used for sentiment),
+        'entity_text' (searched for entities) and 'header_length' (persons
+        are only taken from the first header_length characters). Returns one
+        dict per document with 'polarity', 'person' and 'organizations'.
+        """
+        results = []
+        for document in documents:
+            try:
+                polarity = self.polarity(document['text'])
+            except Exception as e:
+                print(f"Sentiment analysis error: {e}", file=sys.stderr)
+                polarity = None
+            results.append({'polarity': polarity, 'person': None, 'organizations': []})
+
+        nlp = self.nlp
+        if nlp is None or not documents:
+            return results
+
+        texts = (document['entity_text'][:self.max_chars] for document in documents)
+        for result, document, doc in zip(results, documents, nlp.pipe(texts, batch_size=self.batch_size)):
+            organizations = []
+            for entity in doc.ents:
+                if entity.label_ == 'PERSON' and result['person'] is None \
+                        and entity.start_char < document['header_length']:
+                    result['person'] = entity.text.strip()
+                elif entity.label_ == 'ORG':
+                    organizations.append(entity.text.strip())
+            result['organizations'] = list(dict.fromkeys(organizations))[:10]
+
+        return results
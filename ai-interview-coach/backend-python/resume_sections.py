@@ -0,0 +1,63 @@
+import re
+
+# Heading aliases for each resume section
+SECTION_HEADINGS = {
+    'summary': ('summary', 'professional summary', 'profile', 'objective', 'career objective', 'about me'),
+    'skills': ('skills', 'technical skills', 'key skills', 'core skills', 'competencies',
+               'core competencies', 'technologies'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history'),
+    'education': ('education', 'academic background', 'academics', 'qualifications',
+                  'education and training'),
+    'certifications': ('certifications', 'certification', 'certificates', 'licenses',
+                       'licenses and certifications', 'licenses & certifications'),
+    'projects': ('projects', 'personal projects', 'academic projects')
+}
+
+_HEADING_TO_SECTION = {
+    alias: section for section, aliases in SECTION_HEADINGS.items() for alias in aliases
+}
+
+# A heading on its own line ("EDUCATION", "Skills:"), optionally followed by
+# inline content after a colon ("Skills: Python, SQL")
+HEADING_PATTERN = re.compile(
+    r'^\s*(?P<heading>' +
+    '|'.join(re.escape(alias) for alias in sorted(_HEADING_TO_SECTION, key=len, reverse=True)) +
+    r')\s*(?::\s*(?P<rest>.*?))?\s*$',
+    re.IGNORECASE
+)
+
+
+class ResumeSections:
+    """A resume split into its sections in a single pass over the lines.
+
+    Text before the first recognized heading is kept as 'header'. Sections
+    that appear more than once are joined.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.sections = {}
+
+        current = 'header'
+        lines = {current: []}
+        for line in text.split('\n'):
+            match = HEADING_PATTERN.match(line)
+            if match:
+                current = _HEADING_TO_SECTION[match.group('heading').lower()]
+                lines.setdefault(current, [])
+                if match.group('rest'):
+                    lines[current].append(match.group('rest'))
+            else:
+                lines[current].append(line)
+
+        for section, section_lines in lines.items():
+            self.sections[section] = "\n".join(section_lines)
+
+    def has(self, section):
+        return section in self.sections
+
+    def get(self, *sections):
+        """Text of the given sections that exist, or the whole resume if none do"""
+        found = [self.sections[section] for section in sections if section in self.sections]
+        return "\n".join(found) if found else self.text
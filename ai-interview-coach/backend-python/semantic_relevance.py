@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import zlib
+
+from question_index import get_question_index, keywords
+
+# Set RELEVANCE_ENGINE=semantic to score relevance by embedding similarity
+# instead of keyword overlap
+SEMANTIC_ENABLED = os.environ.get('RELEVANCE_ENGINE', 'keywords') == 'semantic'
+
+# Small CPU sentence-transformers model; without the package a hashing embedder is used
+SEMANTIC_MODEL = os.environ.get('SEMANTIC_MODEL', 'all-MiniLM-L6-v2')
+
+EMBEDDING_CACHE_DIR = os.environ.get(
+    'EMBEDDING_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'question_embeddings')
+)
+
+# Answers embedded per model call
+EMBEDDING_BATCH_SIZE = 32
+
+
+class HashingEmbedder:
+    """Dependency-free fallback: feature-hashed stemmed keywords and their
+    character trigrams, so related word forms still overlap"""
+
+    # Cosine similarity that maps to relevance 0 and 100
+    floor = 0.05
+    ceiling = 0.45
+
+    def __init__(self, dimensions=1024):
+        self.dimensions = dimensions
+        # Part of the embedding cache key; bump when keywords() changes
+        self.name = f"hashing-{dimensions}-2"
+
+    def features(self, text):
+        for term in keywords(text):
+            yield term, 1.0
+            padded = f"#{term}#"
+            for start in range(len(padded) - 2):
+                yield padded[start:start + 3], 0.3
+
+    def encode(self, texts, batch_size=EMBEDDING_BATCH_SIZE):
+        import numpy as np
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self.features(text):
+                vectors[row, zlib.crc32(feature.encode('utf-8')) % self.dimensions] += weight
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+class SentenceTransformerEmbedder:
+    """Local sentence-transformers model on the CPU"""
+
+    floor = 0.15
+    ceiling = 0.65
+
+    def __init__(self, model_name=SEMANTIC_MODEL):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name, device='cpu')
+        self.name = model_name
+
+    def encode(self, texts, batch_size=EMBEDDING_BATCH_SIZE):
+        import numpy as np
+        vectors = self.model.encode(
+            list(texts), batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+
+def load_embedder(model_name=SEMANTIC_MODEL):
+    try:
+        return SentenceTransformerEmbedder(model_name)
+    except Exception as e:
+        print(f"Embedding model {model_name} not available, using hashing embedder: {e}", file=sys.stderr)
+        return HashingEmbedder()
+
+
+class SemanticRelevance:
+    """Relevance of answers to questions by embedding similarity.
+
+    Embeddings of every question in the question index are computed once,
+    saved under EMBEDDING_CACHE_DIR and memory-mapped, so worker processes
+    share one copy. Answers are embedded in batches and compared with one
+    vectorized dot product per batch.
+    """
+
+    def __init__(self, index=None, embedder=None, cache_dir=EMBEDDING_CACHE_DIR,
+                 batch_size=EMBEDDING_BATCH_SIZE):
+        self.index = index or get_question_index()
+        self._embedder = embedder
+        self.cache_dir = cache_dir
+        self.batch_size = batch_size
+        self.matrix = None
+        self.rows = {}
+        # (embedder, question file mtime) the matrix was built for
+        self.matrix_state = None
+        self.lock = threading.Lock()
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = load_embedder()
+        return self._embedder
+
+    def warm_up(self):
+        """Load the model and the question matrix now instead of on the first answer"""
+        with self.lock:
+            self.question_matrix()
+
+    def question_matrix(self):
+        """(question id -> row, memory-mapped matrix), rebuilt when the questions change"""
+        self.index.refresh()
+        state = (self.embedder.name, self.index.mtime)
+        if state == self.matrix_state:
+            return self.rows, self.matrix
+
+        import numpy as np
+        questions = self.index.questions
+        ids = sorted(questions)
+        # Cache file named after the model and the question texts
+        content = json.dumps([self.embedder.name, [[question_id, questions[question_id]] for question_id in ids]])
+        key = hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+        rows = {question_id: row for row, question_id in enumerate(ids)}
+        matrix = None
+        if ids:
+            path = os.path.join(self.cache_dir, f"{key}.npy")
+            try:
+                if not os.path.exists(path):
+                    vectors = self.embedder.encode([questions[question_id] for question_id in ids], self.batch_size)
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    temp_path = f"{path}.{os.getpid()}.tmp.npy"
+                    np.save(temp_path, vectors)
+                    os.replace(temp_path, path)
+                matrix = np.load(path, mmap_mode='r')
+            except OSError as e:
+                # Unwritable cache directory: keep the matrix in memory
+                print(f"Could not cache question embeddings: {e}", file=sys.stderr)
+                matrix = self.embedder.encode([questions[question_id] for question_id in ids], self.batch_size)
+
+        self.rows, self.matrix, self.matrix_state = rows, matrix, state
+        return rows, matrix
+
+    def score_batch(self, items):
+        """Relevance (0-100) of every (question, answer, question_id) item in one call"""
+        import numpy as np
+        if not items:
+            return []
+
+        with self.lock:
+            rows, matrix = self.question_matrix()
+            embedder = self.embedder
+
+            # Indexed questions come from the matrix, the others are embedded once each
+            question_rows = []
+            adhoc = {}
+            for question, _, question_id in items:
+                indexed_id = self.index.indexed_id(question_id, question)
+                row = rows.get(indexed_id) if indexed_id is not None else None
+                if row is None and question and question not in adhoc:
+                    adhoc[question] = len(adhoc)
+                question_rows.append(row)
+
+            adhoc_vectors = embedder.encode(list(adhoc), self.batch_size) if adhoc else None
+            answer_vectors = embedder.encode([answer or '' for _, answer, _ in items], self.batch_size)
+
+        question_vectors = np.zeros_like(answer_vectors)
+        indexed = [position for position, row in enumerate(question_rows) if row is not None]
+        if indexed:
+            question_vectors[indexed] = matrix[[question_rows[position] for position in indexed]]
+        others = [position for position, row in enumerate(question_rows) if row is None and items[position][0]]
+        if others:
+            question_vectors[others] = adhoc_vectors[[adhoc[items[position][0]] for position in others]]
+        has_question = np.zeros(len(items), dtype=bool)
+        has_question[indexed + others] = True
+
+        similarity = np.einsum('ij,ij->i', question_vectors, answer_vectors)
+        scores = np.clip((similarity - embedder.floor) / (embedder.ceiling - embedder.floor), 0, 1) * 100
+
+        # Same neutral score as keyword relevance when there is no question
+        scores[~has_question] = 50
+        return [float(score) for score in scores]
+
+    def score(self, question, answer, question_id=None):
+        return self.score_batch([(question, answer, question_id)])[0]
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_semantic_relevance():
+    """Get the process-wide SemanticRelevance, or None unless RELEVANCE_ENGINE=semantic"""
+    global _engine
+    if not SEMANTIC_ENABLED:
+        return None
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = SemanticRelevance()
+    return _engine
@@ -0,0 +1,116 @@
+from collections import deque
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+class SkillMatcher:
+    """Multi-keyword matcher (Aho-Corasick automaton) with word-boundary checks.
+
+    Every keyword is added with a tag, e.g. 'skill' or 'language', and a single
+    pass over the text finds all keywords of every tag. Keywords only match as
+    whole words, so 'r' or 'go' no longer match inside other words.
+    """
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        self.keywords = []
+        self.keyword_tags = []
+        self._keyword_ids = {}
+        self._built = True
+
+    def add(self, keyword, tag):
+        """Add a keyword under a tag. Matching is case-insensitive."""
+        keyword = keyword.lower().strip()
+        if not keyword:
+            return
+
+        if keyword in self._keyword_ids:
+            self.keyword_tags[self._keyword_ids[keyword]].add(tag)
+            return
+
+        keyword_id = len(self.keywords)
+        self._keyword_ids[keyword] = keyword_id
+        self.keywords.append(keyword)
+        self.keyword_tags.append({tag})
+
+        node = 0
+        for char in keyword:
+            if char not in self.goto[node]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[node][char] = len(self.goto) - 1
+            node = self.goto[node][char]
+        self.output[node].append(keyword_id)
+        self._built = False
+
+    def add_all(self, keywords, tag):
+        for keyword in keywords:
+            self.add(keyword, tag)
+
+    def build(self):
+        """Compute failure links; called automatically before the first search"""
+        queue = deque()
+        for node in self.goto[0].values():
+            self.fail[node] = 0
+            queue.append(node)
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                if self.fail[child] == child:
+                    self.fail[child] = 0
+                # Inherit the keywords that end at the failure state
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+        self._built = True
+
+    def scan(self, text):
+        """Yield (start, end, keyword) for every whole-word keyword in text"""
+        if not self._built:
+            self.build()
+
+        text_lower = text.lower()
+        length = len(text_lower)
+        node = 0
+
+        for position, char in enumerate(text_lower):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+
+            for keyword_id in self.output[node]:
+                keyword = self.keywords[keyword_id]
+                start = position - len(keyword) + 1
+                end = position + 1
+
+                # Only check boundaries on the sides where the keyword is a word character
+                if _is_word_char(keyword[0]) and start > 0 and _is_word_char(text_lower[start - 1]):
+                    continue
+                if _is_word_char(keyword[-1]) and end < length and _is_word_char(text_lower[end]):
+                    continue
+
+                yield start, end, keyword
+
+    def find(self, text):
+        """Find keywords in text, grouped by tag in order of first occurrence"""
+        found = {}
+        seen = set()
+
+        for _, _, keyword in self.scan(text):
+            if keyword in seen:
+                continue
+            seen.add(keyword)
+            for tag in self.keyword_tags[self._keyword_ids[keyword]]:
+                found.setdefault(tag, []).append(keyword)
+
+        return found
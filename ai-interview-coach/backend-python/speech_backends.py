@@ -0,0 +1,144 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+# Speech-to-text backend used when none is passed explicitly
+DEFAULT_BACKEND = os.environ.get('VOICE_STT_BACKEND', 'google')
+
+# Long recordings are transcribed in chunks of about this many seconds
+DEFAULT_CHUNK_SECONDS = 30
+
+# Vosk models loaded in this process, by model path
+_vosk_models = {}
+_vosk_lock = threading.Lock()
+
+
+def chunk_bounds(audio, chunk_seconds):
+    """Split points for chunked transcription, cutting inside silences where possible"""
+    total = len(audio.samples)
+    chunk_size = int(chunk_seconds * audio.sample_rate) if chunk_seconds else 0
+    if chunk_size <= 0 or total <= chunk_size:
+        return [(0, total)]
+
+    # Middle of every silent gap between non-silent intervals
+    intervals = audio.nonsilent_intervals(top_db=30)
+    gaps = [int(end + next_start) // 2 for (_, end), (next_start, _) in zip(intervals[:-1], intervals[1:])]
+
+    bounds = []
+    start = 0
+    while total - start > chunk_size:
+        # Prefer the silence closest to the target length, allowing +-25%
+        target = start + chunk_size
+        slack = chunk_size // 4
+        candidates = [gap for gap in gaps if target - slack <= gap <= min(target + slack, total - 1)]
+        end = min(candidates, key=lambda gap: abs(gap - target)) if candidates else target
+        bounds.append((start, end))
+        start = end
+    bounds.append((start, total))
+    return bounds
+
+
+class SpeechBackend:
+    """Base class for speech-to-text engines working on an AudioBuffer"""
+
+    name = 'base'
+
+    def __init__(self, chunk_seconds=DEFAULT_CHUNK_SECONDS):
+        self.chunk_seconds = chunk_seconds
+
+    def transcribe(self, audio):
+        """Transcribe a whole buffer, chunk by chunk for long recordings"""
+        parts = []
+        for start, end in chunk_bounds(audio, self.chunk_seconds):
+            text = self.transcribe_chunk(audio.slice(start, end))
+            if text:
+                parts.append(text)
+        return " ".join(parts)
+
+    def transcribe_chunk(self, audio):
+        raise NotImplementedError
+
+
+class GoogleBackend(SpeechBackend):
+    """Google Web Speech API through speech_recognition (needs network access)"""
+
+    name = 'google'
+
+    def __init__(self, chunk_seconds=DEFAULT_CHUNK_SECONDS):
+        super().__init__(chunk_seconds)
+        import speech_recognition as sr
+        self.sr = sr
+        self.recognizer = sr.Recognizer()
+
+    def transcribe_chunk(self, audio):
+        try:
+            audio_data = self.sr.AudioData(audio.to_pcm16(), audio.sample_rate, 2)
+            return self.recognizer.recognize_google(audio_data)
+        except self.sr.UnknownValueError:
+            return ""
+        except self.sr.RequestError as e:
+            print(f"Could not request results; {e}")
+            return ""
+
+
+class VoskBackend(SpeechBackend):
+    """Offline CPU transcription with a local Vosk model, loaded once per process"""
+
+    name = 'vosk'
+
+    def __init__(self, model_path=None, chunk_seconds=DEFAULT_CHUNK_SECONDS):
+        super().__init__(chunk_seconds)
+        self.model_path = model_path or os.environ.get('VOSK_MODEL_PATH', 'models/vosk-model-small-en-us')
+        self.model = self.load_model(self.model_path)
+
+    @staticmethod
+    def load_model(model_path):
+        with _vosk_lock:
+            if model_path not in _vosk_models:
+                import vosk
+                vosk.SetLogLevel(-1)
+                _vosk_models[model_path] = vosk.Model(model_path)
+            return _vosk_models[model_path]
+
+    def transcribe_chunk(self, audio):
+        import vosk
+
+        recognizer = vosk.KaldiRecognizer(self.model, audio.sample_rate)
+        pcm = audio.to_pcm16()
+        # Feed the recognizer in small pieces (4000 samples of 16-bit audio)
+        for offset in range(0, len(pcm), 8000):
+            recognizer.AcceptWaveform(pcm[offset:offset + 8000])
+        return json.loads(recognizer.FinalResult()).get('text', '')
+
+
+class StubBackend(SpeechBackend):
+    """Deterministic backend for tests: returns a fixed transcript for any audio"""
+
+    name = 'stub'
+
+    def __init__(self, text="I have three years of experience working with Python.", chunk_seconds=None):
+        super().__init__(chunk_seconds)
+        self.text = text
+
+    def transcribe_chunk(self, audio):
+        # Silent audio gives no transcript, like the real engines
+        if len(audio.samples) == 0 or not np.any(audio.samples):
+            return ""
+        return self.text
+
+
+BACKENDS = {
+    'google': GoogleBackend,
+    'vosk': VoskBackend,
+    'stub': StubBackend
+}
+
+
+def get_backend(name=None, **kwargs):
+    """Create a speech-to-text backend by name ('google', 'vosk' or 'stub')"""
+    name = name or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown speech-to-text backend: {name}")
+    return BACKENDS[name](**kwargs)
@@ -0,0 +1,36 @@
+from question_index import QuestionIndex, keywords, stem
+
+
+def test_stem_groups_word_forms():
+    assert stem('challenging') == stem('challenges') == stem('challenge')
+    assert stem('handled') == stem('handle')
+    assert stem('industries') == stem('industry')
+    assert stem('planned') == stem('plan')
+    assert stem('managers') == stem('manager') == stem('management')
+    assert stem('businesses') == stem('business')
+
+
+def test_stem_keeps_short_stems_whole():
+    assert stem('career') == stem('careers') == 'career'
+    assert stem('career') != stem('car')
+    assert stem('early') == 'early'
+    assert stem('quickly') == 'quick'
+
+
+def test_keywords_drop_stopwords():
+    assert keywords('Describe a challenging project you led') == ['describ', 'challeng', 'project', 'led']
+
+
+def test_relevance_by_question_id():
+    index = QuestionIndex(path='')
+    index.build({'1': 'Describe your career goals', '2': 'How do you handle conflict?'})
+    assert index.relevance('I described my careers goal: to lead a team', question_id=1) == 100
+    assert index.relevance('I like cars', question_id=1) == 0
+
+
+def test_relevance_ignores_index_when_question_text_differs():
+    index = QuestionIndex(path='')
+    index.build({'1': 'Describe your career goals', '2': 'How do you handle conflict?'})
+    assert index.relevance('I like cars', question_id=1, question='What cars do you like?') == 100
+    assert index.relevance('I like cars', question_id=1, question='Describe your career goals.') == 0
+    assert index.question_weights(1, 'describe YOUR career goals') is index.weights['1']
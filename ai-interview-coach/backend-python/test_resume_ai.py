@@ -0,0 +1,9 @@
+from resume_ai import ResumeAnalyzer
+
+
+def test_certification_bonus_counts_extracted_certifications():
+    analyzer = ResumeAnalyzer.__new__(ResumeAnalyzer)
+    education = {'degrees': []}
+    base = analyzer.calculate_score([], [], education, 0, [])
+    assert analyzer.calculate_score([], [], education, 0, ['AWS', 'PMP']) == base + 4
+    assert analyzer.calculate_score([], [], education, 0, ['AWS'] * 8) == base + 10
@@ -1,50 +1,139 @@
-import language_tool_python
 import re
-from textblob import TextBlob
 import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from grammar_service import get_grammar_checker
+from question_index import get_question_index
+from semantic_relevance import get_semantic_relevance
+from instrumentation import span, start_timings, attach_timings, profiled
+
+# Scorer used inside batch worker processes
+_scorer = None
+
+
+def _score_pair(question, answer, question_id=None, relevance=None):
+    global _scorer
+    if _scorer is None:
+        _scorer = TextAnalyzer()
+    return _scorer.score_answer(question, answer, question_id, relevance)
+
 
 class TextAnalyzer:
     def __init__(self):
-        self.tool = language_tool_python.LanguageTool('en-US')
+        # Shared with every other analyzer in this process
+        self.tool = get_grammar_checker()
+        # Keyword weights of the known questions, for relevance scoring
+        self.questions = get_question_index()
+        # Embedding similarity instead, with RELEVANCE_ENGINE=semantic (None otherwise)
+        self.semantic = get_semantic_relevance()
+    
+    @profiled('text')
+    def analyze_text(self, question, answer, matches=None, timings=None, question_id=None):
+        """Analyze text answer for grammar, vocabulary, and clarity.
+        
+        question_id selects the question's precomputed keywords from the
+        question index; question is used when it isn't indexed.
+        timings may be True or a dict to add per-stage seconds to the result.
+        """
+        timings = start_timings(timings)
+        result = self.run_analysis(question, answer, matches, timings, question_id=question_id)
+        return attach_timings(result, timings)
+    
+    @profiled('text_batch')
+    def analyze_batch(self, pairs, workers=None, timings=None):
+        """Analyze every (question, answer[, question_id]) pair of a test in one call.
+        
+        All answers are grammar checked in one LanguageTool round-trip, and
+        with workers > 1 the CPU-only scores are spread over worker processes.
+        The test score is the mean overall score, failed answers counting as 0.
+        """
+        timings = start_timings(timings)
+        try:
+            pairs = [
+                (pair[0] or '', pair[1] or '', pair[2] if len(pair) > 2 else None)
+                for pair in pairs
+            ]
+            
+            with span(timings, 'grammar_check'):
+                all_matches = self.check_answers([answer for _, answer, _ in pairs])
+            
+            with span(timings, 'score'):
+                all_scores = self.score_answers(pairs, workers)
+            
+            results = [
+                self.run_analysis(question, answer, matches, timings, scores)
+                for (question, answer, _), matches, scores in zip(pairs, all_matches, all_scores)
+            ]
+            total = sum(result['overall_score'] for result in results if result['success'])
+            
+            result = {
+                'success': True,
+                'results': results,
+                'answer_count': len(results),
+                'average_score': round(total / len(results), 2) if results else 0
+            }
+        except Exception as e:
+            result = {'success': False, 'error': str(e)}
+        return attach_timings(result, timings)
+    
+    def score_answers(self, pairs, workers=None):
+        """score_answer for every pair, over a process pool when workers > 1"""
+        if self.semantic is not None:
+            # Embed all answers in one batched call
+            relevances = self.semantic.score_batch(pairs)
+            pairs = [pair + (relevance,) for pair, relevance in zip(pairs, relevances)]
+        
+        if not workers or workers <= 1 or len(pairs) < 2:
+            return [self.score_answer(*pair) for pair in pairs]
+        
+        with ProcessPoolExecutor(max_workers=min(workers, len(pairs))) as executor:
+            chunksize = max(1, len(pairs) // (workers * 4))
+            return list(executor.map(_score_pair, *zip(*pairs), chunksize=chunksize))
+    
+    def score_answer(self, question, answer, question_id=None, relevance=None):
+        """CPU-only scores of an answer: (vocabulary, clarity, relevance)"""
+        # Vocabulary richness (unique words percentage)
+        words = re.findall(r'\b\w+\b', answer.lower())
+        vocab_score = self.calculate_vocab_score(len(words), len(set(words)))
+        
+        # Clarity score based on sentence structure
+        clarity_score = self.calculate_clarity_score(answer)
+        
+        # Relevance to question
+        if relevance is None:
+            relevance = self.calculate_relevance_score(question, answer, question_id)
+        return vocab_score, clarity_score, relevance
     
-    def analyze_text(self, question, answer):
-        """Analyze text answer for grammar, vocabulary, and clarity"""
+    def run_analysis(self, question, answer, matches=None, timings=None, scores=None, question_id=None):
         try:
-            # Grammar check
-            matches = self.tool.check(answer)
+            # Grammar check (matches may come from a batched check_answers call)
+            if matches is None:
+                with span(timings, 'grammar_check'):
+                    matches = self.tool.check(answer)
             grammar_errors = len(matches)
             
             # Spelling mistakes
             spelling_errors = sum(1 for match in matches if match.ruleIssueType == 'misspelling')
             
-            # Calculate grammar score (100 - errors * 2, minimum 0)
-            grammar_score = max(0, 100 - (grammar_errors * 2))
-            
-            # Vocabulary richness (unique words percentage)
-            words = re.findall(r'\b\w+\b', answer.lower())
-            unique_words = set(words)
-            vocab_score = (len(unique_words) / max(len(words), 1)) * 50
+            grammar_score = self.calculate_grammar_score(grammar_errors)
             
-            # Clarity score based on sentence structure
-            clarity_score = self.calculate_clarity_score(answer)
+            # Scores may come from score_answers in a batch
+            if scores is None:
+                with span(timings, 'score'):
+                    scores = self.score_answer(question, answer, question_id)
+            vocab_score, clarity_score, relevance_score = scores
             
-            # Relevance to question
-            relevance_score = self.calculate_relevance_score(question, answer)
-            
-            # Overall score (weighted average)
-            overall_score = (
-                grammar_score * 0.3 +
-                vocab_score * 0.2 +
-                clarity_score * 0.3 +
-                relevance_score * 0.2
+            overall_score = self.calculate_overall_score(
+                grammar_score, vocab_score, clarity_score, relevance_score
             )
             
             # Generate feedback
-            feedback = self.generate_feedback(
-                grammar_errors, spelling_errors, 
-                grammar_score, vocab_score, 
-                clarity_score, relevance_score
-            )
+            with span(timings, 'feedback'):
+                feedback = self.generate_feedback(
+                    grammar_errors, spelling_errors, 
+                    grammar_score, vocab_score, 
+                    clarity_score, relevance_score
+                )
             
             return {
                 'success': True,
@@ -62,16 +151,45 @@ class TextAnalyzer:
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    def check_answers(self, answers):
+        """Grammar check all answers of a test in one batched call"""
+        return self.tool.check_batch(answers)
+    
+    def start_session(self, question, question_id=None):
+        """Start incremental scoring of an answer that is still being typed"""
+        from text_session import TextSession
+        return TextSession(self, question, question_id=question_id)
+    
+    def calculate_grammar_score(self, grammar_errors):
+        """100 - errors * 2, minimum 0"""
+        return max(0, 100 - (grammar_errors * 2))
+    
+    def calculate_vocab_score(self, word_count, unique_count):
+        """Vocabulary richness from the share of unique words"""
+        return (unique_count / max(word_count, 1)) * 50
+    
+    def calculate_overall_score(self, grammar_score, vocab_score, clarity_score, relevance_score):
+        """Overall score (weighted average)"""
+        return (
+            grammar_score * 0.3 +
+            vocab_score * 0.2 +
+            clarity_score * 0.3 +
+            relevance_score * 0.2
+        )
+    
     def calculate_clarity_score(self, text):
         """Calculate clarity based on sentence length and complexity"""
         sentences = re.split(r'[.!?]+', text)
         sentences = [s.strip() for s in sentences if s.strip()]
-        
-        if not sentences:
+        return self.clarity_from_lengths([len(s.split()) for s in sentences])
+    
+    def clarity_from_lengths(self, lengths):
+        """Clarity score from the word count of every sentence"""
+        if not lengths:
             return 0
         
         # Average sentence length score
-        avg_length = sum(len(s.split()) for s in sentences) / len(sentences)
+        avg_length = sum(lengths) / len(lengths)
         if 10 <= avg_length <= 20:
             length_score = 100
         elif 5 <= avg_length < 10 or 20 < avg_length <= 25:
@@ -80,23 +198,16 @@ class TextAnalyzer:
             length_score = 40
         
         # Sentence structure variety (simple metric)
-        structure_variety = min(len(set(len(s.split()) for s in sentences)) * 20, 100)
+        structure_variety = min(len(set(lengths)) * 20, 100)
         
         return (length_score + structure_variety) / 2
     
-    def calculate_relevance_score(self, question, answer):
+    def calculate_relevance_score(self, question, answer, question_id=None):
         """Calculate how relevant the answer is to the question"""
-        # Simple keyword matching
-        question_keywords = set(re.findall(r'\b\w+\b', question.lower()))
-        answer_keywords = set(re.findall(r'\b\w+\b', answer.lower()))
-        
-        common_keywords = question_keywords.intersection(answer_keywords)
-        
-        if not question_keywords:
-            return 50
-        
-        relevance = len(common_keywords) / len(question_keywords) * 100
-        return min(relevance, 100)
+        if self.semantic is not None:
+            return self.semantic.score(question, answer, question_id)
+        # TF-IDF weighted share of the question's stemmed keywords in the answer
+        return self.questions.relevance(answer, question_id, question)
     
     def generate_feedback(self, grammar_errors, spelling_errors, 
                          grammar_score, vocab_score, clarity_score, relevance_score):
@@ -160,11 +271,41 @@ class TextAnalyzer:
         
         return suggestions[:3]  # Return top 3 suggestions
 
-# Example usage
+def batch_pairs(data):
+    """(question, answer, question_id) triples from decoded JSON: a list, or
+    {"answers": [...]}, of {"question": ..., "answer": ..., "question_id": ...}
+    objects or [question, answer(, question_id)] pairs"""
+    if isinstance(data, dict):
+        data = data.get('answers', [])
+    pairs = []
+    for item in data:
+        if isinstance(item, dict):
+            pairs.append((item.get('question', ''), item.get('answer', ''), item.get('question_id')))
+        else:
+            pairs.append((item[0], item[1], item[2] if len(item) > 2 else None))
+    return pairs
+
+
+# Usage:
+#   python text_ai.py "question" "answer" [question_id]
+#   python text_ai.py --batch [--workers N] < answers.json
 if __name__ == "__main__":
     analyzer = TextAnalyzer()
-    question = "Tell me about your experience with Python"
-    answer = "I have 3 years of experience with Python. I used it for data analysis and web development."
+    args = sys.argv[1:]
+    
+    if args and args[0] == '--batch':
+        workers = int(args[2]) if len(args) > 2 and args[1] == '--workers' else None
+        try:
+            pairs = batch_pairs(json.load(sys.stdin))
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            print(json.dumps({'success': False, 'error': f"Invalid batch input: {e}"}))
+            sys.exit(1)
+        result = analyzer.analyze_batch(pairs, workers=workers)
+    elif len(args) >= 2:
+        result = analyzer.analyze_text(args[0], args[1], question_id=args[2] if len(args) > 2 else None)
+    else:
+        question = "Tell me about your experience with Python"
+        answer = "I have 3 years of experience with Python. I used it for data analysis and web development."
+        result = analyzer.analyze_text(question, answer)
     
-    result = analyzer.analyze_text(question, answer)
-    print(json.dumps(result, indent=2))
\ No newline at end of file
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,172 @@
+import re
+import threading
+from collections import Counter
+
+from question_index import STOPWORDS, stem
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+# A sentence body followed by its closing punctuation; the pieces cover the
+# text exactly and their bodies are what re.split(r'[.!?]+') gives
+SENTENCE_PATTERN = re.compile(r'[^.!?]*[.!?]*')
+
+
+def split_sentences(text):
+    return [match.group() for match in SENTENCE_PATTERN.finditer(text) if match.group()]
+
+
+class Sentence:
+    """One sentence of an answer and what was scored from it"""
+
+    __slots__ = ('text', 'words', 'length', 'complete', 'matches')
+
+    def __init__(self, text):
+        self.text = text
+        body = text.rstrip('.!?')
+        # Punctuation is never part of a word, so these add up to the answer's words
+        self.words = WORD_PATTERN.findall(text.lower())
+        self.length = len(body.split())
+        # Only finished sentences are grammar checked while typing
+        self.complete = body != text
+        self.matches = None
+
+
+class TextSession:
+    """Incremental scoring of an answer that is still being typed.
+
+    Keeps the answer split into sentences together with running word counts
+    and per-sentence grammar matches. An edit re-splits the text (one regex
+    pass) but only sentences whose text changed are re-tokenized and grammar
+    checked, so live scores cost about as much as the edit itself. finish()
+    returns the same result format as TextAnalyzer.analyze_text.
+    """
+
+    def __init__(self, analyzer, question, check_grammar=True, question_id=None):
+        self.analyzer = analyzer
+        self.question = question
+        self.question_id = question_id
+        self.question_weights = analyzer.questions.question_weights(question_id, question)
+        self.check_grammar = check_grammar
+
+        self.text = ''
+        self.sentences = []
+        self.word_counts = Counter()
+        self.word_total = 0
+        self.lock = threading.Lock()
+
+    def apply_edit(self, start, end, replacement=''):
+        """Replace text[start:end] with replacement and return the live scores"""
+        with self.lock:
+            if not 0 <= start <= end <= len(self.text):
+                raise ValueError(f"Edit range {start}-{end} outside the answer (length {len(self.text)})")
+            return self._update(self.text[:start] + replacement + self.text[end:])
+
+    def update(self, text):
+        """Set the whole answer and return the live scores"""
+        with self.lock:
+            return self._update(text)
+
+    def _update(self, text):
+        new_texts = split_sentences(text)
+        old = self.sentences
+
+        # Sentences before and after the edited region are kept as they are
+        prefix = 0
+        limit = min(len(old), len(new_texts))
+        while prefix < limit and old[prefix].text == new_texts[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old[-1 - suffix].text == new_texts[-1 - suffix]:
+            suffix += 1
+
+        removed = old[prefix:len(old) - suffix]
+        reusable = {sentence.text: sentence for sentence in removed}
+        added = [reusable.get(sentence_text) or Sentence(sentence_text)
+                 for sentence_text in new_texts[prefix:len(new_texts) - suffix]]
+
+        for sentence in removed:
+            self._count_words(sentence.words, -1)
+        for sentence in added:
+            self._count_words(sentence.words, 1)
+
+        self.sentences = old[:prefix] + added + old[len(old) - suffix:]
+        self.text = text
+
+        if self.check_grammar:
+            self._check_sentences([sentence for sentence in added if sentence.complete])
+        return self.snapshot()
+
+    def _count_words(self, words, change):
+        self.word_total += change * len(words)
+        for word in words:
+            count = self.word_counts[word] + change
+            if count > 0:
+                self.word_counts[word] = count
+            else:
+                del self.word_counts[word]
+
+    def _check_sentences(self, sentences):
+        """Grammar check sentences that have no matches yet, in one round-trip"""
+        sentences = [sentence for sentence in sentences if sentence.matches is None]
+        if not sentences:
+            return
+        try:
+            results = self.analyzer.tool.check_batch([sentence.text for sentence in sentences])
+        except Exception as e:
+            print(f"Live grammar check error: {e}")
+            return
+        for sentence, matches in zip(sentences, results):
+            sentence.matches = matches
+
+    def snapshot(self):
+        """Live scores for the answer as it is now"""
+        analyzer = self.analyzer
+        lengths = [sentence.length for sentence in self.sentences if sentence.length]
+        checked = [sentence for sentence in self.sentences if sentence.matches is not None]
+        grammar_errors = sum(len(sentence.matches) for sentence in checked)
+
+        answer_terms = {stem(word) for word in self.word_counts if word not in STOPWORDS}
+
+        grammar_score = analyzer.calculate_grammar_score(grammar_errors)
+        vocab_score = analyzer.calculate_vocab_score(self.word_total, len(self.word_counts))
+        clarity_score = analyzer.clarity_from_lengths(lengths)
+        relevance_score = analyzer.questions.coverage(self.question_weights, answer_terms)
+        overall_score = analyzer.calculate_overall_score(
+            grammar_score, vocab_score, clarity_score, relevance_score
+        )
+
+        return {
+            'success': True,
+            'word_count': self.word_total,
+            'sentence_count': len(lengths),
+            'grammar_errors': grammar_errors,
+            # Sentences not grammar checked yet (the one being typed)
+            'grammar_pending': len(self.sentences) - len(checked),
+            'grammar_score': round(grammar_score, 2),
+            'vocabulary_score': round(vocab_score, 2),
+            'clarity_score': round(clarity_score, 2),
+            'relevance_score': round(relevance_score, 2),
+            'overall_score': round(overall_score, 2)
+        }
+
+    def finish(self):
+        """Check the remaining sentences and return the full analysis of the answer"""
+        with self.lock:
+            if not self.check_grammar:
+                return self.analyzer.analyze_text(self.question, self.text, question_id=self.question_id)
+
+            self._check_sentences(self.sentences)
+            if any(sentence.matches is None for sentence in self.sentences):
+                # Grammar checker failed; analyze_text reports the error
+                return self.analyzer.analyze_text(self.question, self.text, question_id=self.question_id)
+
+            # Sentence matches moved to offsets in the whole answer
+            matches = []
+            offset = 0
+            for sentence in self.sentences:
+                matches.extend(self.analyzer.tool.relocate(match, offset, None) for match in sentence.matches)
+                offset += len(sentence.text)
+
+            return self.analyzer.analyze_text(
+                self.question, self.text, matches=matches, question_id=self.question_id
+            )
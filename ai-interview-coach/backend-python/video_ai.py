@@ -1,257 +1,439 @@
 import cv2
-import mediapipe as mp
 import numpy as np
 import json
 import tempfile
+import multiprocessing
 import os
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from graph_pool import GraphPool
+from instrumentation import span, add_time, start_timings, attach_timings, profiled
+from frame_sampler import (
+    uniform_indices, stride_indices, sequential_indices, landmark_motion,
+    allocate_by_motion, count_frames, read_frames, downscale, MotionGate
+)
+
+# Default number of frames analyzed per video
+MAX_FRAMES = 300
+
+# Smallest segment worth sending to a separate worker process
+MIN_SEGMENT_FRAMES = 16
+
+# Landmark counts for FaceMesh (refine_landmarks=True) and Pose
+FACE_LANDMARK_COUNT = 478
+POSE_LANDMARK_COUNT = 33
+
+# Face mesh indices
+LEFT_EYE_INDICES = [33, 133, 157, 158, 159, 160, 161, 173]
+RIGHT_EYE_INDICES = [362, 263, 387, 388, 389, 390, 391, 466]
+MOUTH_LEFT = 61
+MOUTH_RIGHT = 291
+MOUTH_TOP = 13
+MOUTH_BOTTOM = 14
+
+# Pose indices (mp.solutions.pose.PoseLandmark)
+LEFT_SHOULDER = 11
+RIGHT_SHOULDER = 12
+LEFT_WRIST = 15
+RIGHT_WRIST = 16
+LEFT_HIP = 23
+RIGHT_HIP = 24
+
+def copy_landmarks(landmark_list, out):
+    """Copy MediaPipe landmarks into a preallocated (landmarks, 3) array row"""
+    for i, landmark in enumerate(landmark_list.landmark[:len(out)]):
+        out[i] = (landmark.x, landmark.y, landmark.z)
+
+def merge_landmarks(first, second):
+    """Merge two landmark dicts from extract_landmarks, ordered by frame index"""
+    merged = {key: np.concatenate([first[key], second[key]]) for key in first}
+    order = np.argsort(merged['frame_indices'], kind='stable')
+    return {key: value[order] for key, value in merged.items()}
+
+# Per-process state of segment workers: one analyzer with a one-entry graph pool
+_worker_analyzer = None
+
+def _init_segment_worker(config):
+    global _worker_analyzer
+    _worker_analyzer = VideoAnalyzer(**config)
+    _worker_analyzer.graph_pool.warm_up()
+
+def _extract_segment(video_path, indices, collect_timings=False):
+    """(landmarks, stage timings or None) of one segment"""
+    timings = {} if collect_timings else None
+    with _worker_analyzer.graph_pool.checkout() as (face_mesh, pose):
+        landmarks = _worker_analyzer.extract_landmarks(video_path, indices, face_mesh, pose, timings)
+    return landmarks, timings
 
 class VideoAnalyzer:
-    def __init__(self):
-        self.mp_face_mesh = mp.solutions.face_mesh
-        self.mp_pose = mp.solutions.pose
-        self.mp_hands = mp.solutions.hands
-        
-    def analyze_video(self, video_path):
-        """Analyze video for body language and eye contact"""
+    def __init__(self, frame_budget=MAX_FRAMES, sampling='uniform', stride=1,
+                 downscale_width=None, seek_threshold=30, workers=1, pool_size=None,
+                 motion_threshold=2.0, max_skip=10):
+        # Frame sampling: 'uniform' spreads frame_budget frames over the whole
+        # video, 'adaptive' samples more densely where landmarks move quickly,
+        # 'stride' takes every stride-th frame, 'sequential' the first frames only
+        self.frame_budget = frame_budget
+        self.sampling = sampling
+        self.stride = stride
+        # Optional width to shrink frames to before MediaPipe inference
+        self.downscale_width = downscale_width
+        # Gaps longer than this (in frames) are skipped by seeking
+        self.seek_threshold = seek_threshold
+        # Frames that differ from the last inferred frame by less than
+        # motion_threshold reuse its landmarks (None or 0 disables the gate);
+        # a full inference is forced after max_skip reused frames in a row
+        self.motion_threshold = motion_threshold
+        self.max_skip = max_skip
+        
+        # Worker processes for parallel segment extraction (1 = sequential)
+        self.workers = workers
+        self._executor = None
+        
+        # Pre-initialized FaceMesh/Pose graphs, reset and reused for every video
+        self.graph_pool = GraphPool(self.create_graphs, pool_size or workers)
+        
+    @profiled('video')
+    def analyze_video(self, video_path, timings=None):
+        """Analyze video for body language and eye contact.
+        
+        timings may be True or a dict to add per-stage seconds to the result;
+        'mediapipe' is the inference part of 'extract_video_features'.
+        """
+        timings = start_timings(timings)
+        result = self.run_analysis(video_path, timings)
+        return attach_timings(result, timings)
+    
+    def run_analysis(self, video_path, timings=None):
         try:
             # Extract video features
-            features = self.extract_video_features(video_path)
+            with span(timings, 'extract_video_features'):
+                features = self.extract_video_features(video_path, timings)
             
             # Calculate scores
-            eye_contact_score = self.calculate_eye_contact_score(features['eye_contact_frames'])
-            posture_score = self.calculate_posture_score(features['posture_data'])
-            gesture_score = self.calculate_gesture_score(features['gesture_data'])
-            expression_score = self.calculate_expression_score(features['expression_data'])
+            with span(timings, 'score'):
+                eye_contact_score = self.calculate_eye_contact_score(
+                    features['eye_contact_frames'], features['frames_analyzed']
+                )
+                posture_score = self.calculate_posture_score(features['posture_data'])
+                gesture_score = self.calculate_gesture_score(features['gesture_data'])
+                expression_score = self.calculate_expression_score(features['expression_data'])
             
-            # Overall score
-            overall_score = (
-                eye_contact_score * 0.4 +
-                posture_score * 0.3 +
-                gesture_score * 0.2 +
-                expression_score * 0.1
-            )
-            
-            # Generate feedback
-            feedback = self.generate_feedback(
-                eye_contact_score, posture_score, 
-                gesture_score, expression_score,
-                features
-            )
-            
-            return {
-                'success': True,
-                'analysis': {
-                    'eye_contact_score': round(eye_contact_score, 2),
-                    'posture_score': round(posture_score, 2),
-                    'gesture_score': round(gesture_score, 2),
-                    'expression_score': round(expression_score, 2),
-                    'overall_score': round(overall_score, 2),
-                    'total_frames': features['total_frames'],
-                    'duration': features['duration']
-                },
-                'feedback': feedback,
-                'recommendations': self.get_recommendations(overall_score)
-            }
+            with span(timings, 'report'):
+                return self.build_result(
+                    eye_contact_score, posture_score, gesture_score, expression_score, features
+                )
             
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def extract_video_features(self, video_path):
-        """Extract features from video"""
+    def build_result(self, eye_contact_score, posture_score, gesture_score, expression_score, features):
+        """Combine the four scores into the final result"""
+        # Overall score
+        overall_score = (
+            eye_contact_score * 0.4 +
+            posture_score * 0.3 +
+            gesture_score * 0.2 +
+            expression_score * 0.1
+        )
+        
+        # Generate feedback
+        feedback = self.generate_feedback(
+            eye_contact_score, posture_score, 
+            gesture_score, expression_score,
+            features
+        )
+        
+        return {
+            'success': True,
+            'analysis': {
+                'eye_contact_score': round(eye_contact_score, 2),
+                'posture_score': round(posture_score, 2),
+                'gesture_score': round(gesture_score, 2),
+                'expression_score': round(expression_score, 2),
+                'overall_score': round(overall_score, 2),
+                'total_frames': features['total_frames'],
+                'duration': features['duration'],
+                'inference_skipped': round(features['inference_skipped'], 3)
+            },
+            'feedback': feedback,
+            'recommendations': self.get_recommendations(overall_score)
+        }
+    
+    def start_stream(self, fps=30.0, stride=1):
+        """Start incremental analysis for frames that arrive while recording"""
+        from video_stream import VideoStream
+        return VideoStream(self, fps=fps, stride=stride)
+    
+    def extract_video_features(self, video_path, timings=None):
+        """Extract features from frames sampled across the whole video"""
         cap = cv2.VideoCapture(video_path)
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         fps = cap.get(cv2.CAP_PROP_FPS)
+        cap.release()
+        
+        # Some containers (e.g. browser webm recordings) don't report a frame count
+        if total_frames <= 0:
+            total_frames = count_frames(video_path)
         duration = total_frames / fps if fps > 0 else 0
         
-        # Initialize MediaPipe
-        face_mesh = self.mp_face_mesh.FaceMesh(
+        if self.sampling == 'adaptive':
+            # Coarse pass over the whole video, then spend the rest of the
+            # budget in the stretches where the landmarks move the most
+            indices = uniform_indices(total_frames, max(2, self.frame_budget // 2))
+            landmarks = self.collect_landmarks(video_path, indices, timings)
+            motion = landmark_motion(
+                landmarks['face_points'], landmarks['has_face'],
+                landmarks['pose_points'], landmarks['has_pose']
+            )
+            extra = allocate_by_motion(
+                landmarks['frame_indices'], motion,
+                self.frame_budget - len(landmarks['frame_indices'])
+            )
+            if len(extra):
+                landmarks = merge_landmarks(landmarks, self.collect_landmarks(video_path, extra, timings))
+        else:
+            indices = self.sample_indices(total_frames)
+            landmarks = self.collect_landmarks(video_path, indices, timings)
+        
+        return self.summarize_landmarks(landmarks, total_frames, duration)
+    
+    def sample_indices(self, total_frames):
+        """Frame indices to analyze for the configured sampling mode"""
+        if self.sampling == 'stride':
+            return stride_indices(total_frames, self.stride, self.frame_budget)
+        elif self.sampling == 'sequential':
+            return sequential_indices(total_frames, self.frame_budget)
+        return uniform_indices(total_frames, self.frame_budget)
+    
+    def collect_landmarks(self, video_path, indices, timings=None):
+        """Extract landmarks for the given frames, in parallel segments when enabled"""
+        if self.workers > 1 and len(indices) >= self.workers * MIN_SEGMENT_FRAMES:
+            return self.extract_landmarks_parallel(video_path, indices, timings)
+        
+        with self.graph_pool.checkout() as (face_mesh, pose):
+            return self.extract_landmarks(video_path, indices, face_mesh, pose, timings)
+    
+    def extract_landmarks_parallel(self, video_path, indices, timings=None):
+        """Split the frames into one time segment per worker and merge the results"""
+        if self._executor is None:
+            # Spawned, not forked: the pool is created lazily inside the threaded
+            # analysis server, and a fork would copy its threads' state and graphs
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_segment_worker,
+                initargs=(self.worker_config(),)
+            )
+        
+        segments = [segment for segment in np.array_split(indices, self.workers) if len(segment)]
+        results = list(self._executor.map(
+            _extract_segment, [video_path] * len(segments), segments, [timings is not None] * len(segments)
+        ))
+        
+        # Segments run side by side, so a stage takes as long as in the slowest one
+        segment_timings = [stages for _, stages in results if stages]
+        for stage in dict.fromkeys(stage for stages in segment_timings for stage in stages):
+            add_time(timings, stage, max(stages.get(stage, 0) for stages in segment_timings))
+        
+        # Segments are contiguous and in order, so concatenating keeps frame order
+        parts = [landmarks for landmarks, _ in results]
+        return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+    
+    def worker_config(self):
+        """Settings that segment workers need to build an equivalent analyzer"""
+        return {
+            'frame_budget': self.frame_budget,
+            'sampling': self.sampling,
+            'stride': self.stride,
+            'downscale_width': self.downscale_width,
+            'seek_threshold': self.seek_threshold,
+            'motion_threshold': self.motion_threshold,
+            'max_skip': self.max_skip
+        }
+    
+    def close(self):
+        """Shut down the segment worker pool and close the pooled graphs"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self.graph_pool.close()
+    
+    def create_graphs(self):
+        """Create the FaceMesh and Pose graphs (MediaPipe is imported on first use)"""
+        import mediapipe as mp
+        
+        face_mesh = mp.solutions.face_mesh.FaceMesh(
             max_num_faces=1,
             refine_landmarks=True,
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5
         )
         
-        pose = self.mp_pose.Pose(
+        pose = mp.solutions.pose.Pose(
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5
         )
         
-        eye_contact_frames = 0
-        posture_data = []
-        gesture_data = []
-        expression_data = []
-        
+        return face_mesh, pose
+    
+    def extract_landmarks(self, video_path, indices, face_mesh, pose, timings=None):
+        """Run MediaPipe on the given frames and collect landmarks into arrays"""
+        # Preallocated landmark arrays, one row per sampled frame
+        count = len(indices)
+        frame_indices = np.zeros(count, dtype=np.int64)
+        face_points = np.zeros((count, FACE_LANDMARK_COUNT, 3), dtype=np.float32)
+        pose_points = np.zeros((count, POSE_LANDMARK_COUNT, 3), dtype=np.float32)
+        has_face = np.zeros(count, dtype=bool)
+        has_pose = np.zeros(count, dtype=bool)
+        inferred = np.zeros(count, dtype=bool)
+        
+        gate = MotionGate(self.motion_threshold, self.max_skip)
+        cap = cv2.VideoCapture(video_path)
         frame_count = 0
-        while cap.isOpened() and frame_count < min(total_frames, 300):  # Limit to 300 frames
-            ret, frame = cap.read()
-            if not ret:
-                break
+        for index, frame in read_frames(cap, indices, self.seek_threshold):
+            frame_indices[frame_count] = index
+            
+            # Scene unchanged since the last inference: carry its landmarks forward
+            if not gate.needs_inference(frame):
+                face_points[frame_count] = face_points[frame_count - 1]
+                pose_points[frame_count] = pose_points[frame_count - 1]
+                has_face[frame_count] = has_face[frame_count - 1]
+                has_pose[frame_count] = has_pose[frame_count - 1]
+                frame_count += 1
+                continue
+            
+            # Downscale before inference, landmarks are normalized anyway
+            frame = downscale(frame, self.downscale_width)
             
             # Convert BGR to RGB
             rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
             
             # Process with MediaPipe
-            face_results = face_mesh.process(rgb_frame)
-            pose_results = pose.process(rgb_frame)
+            with span(timings, 'mediapipe'):
+                face_results = face_mesh.process(rgb_frame)
+                pose_results = pose.process(rgb_frame)
+            inferred[frame_count] = True
             
-            # Analyze eye contact
             if face_results.multi_face_landmarks:
-                eye_contact = self.detect_eye_contact(face_results.multi_face_landmarks[0])
-                if eye_contact:
-                    eye_contact_frames += 1
+                copy_landmarks(face_results.multi_face_landmarks[0], face_points[frame_count])
+                has_face[frame_count] = True
             
-            # Analyze posture
             if pose_results.pose_landmarks:
-                posture = self.analyze_posture(pose_results.pose_landmarks)
-                posture_data.append(posture)
-            
-            # Analyze gestures
-            if pose_results.pose_landmarks:
-                gesture = self.detect_gestures(pose_results.pose_landmarks)
-                gesture_data.append(gesture)
-            
-            # Analyze facial expression
-            if face_results.multi_face_landmarks:
-                expression = self.analyze_expression(face_results.multi_face_landmarks[0])
-                expression_data.append(expression)
+                copy_landmarks(pose_results.pose_landmarks, pose_points[frame_count])
+                has_pose[frame_count] = True
             
             frame_count += 1
         
         cap.release()
         
+        return {
+            'frame_indices': frame_indices[:frame_count],
+            'face_points': face_points[:frame_count],
+            'has_face': has_face[:frame_count],
+            'pose_points': pose_points[:frame_count],
+            'has_pose': has_pose[:frame_count],
+            'inferred': inferred[:frame_count]
+        }
+    
+    def summarize_landmarks(self, landmarks, total_frames, duration):
+        """Turn per-frame landmark arrays into the feature dict used for scoring"""
+        face_points = landmarks['face_points'][landmarks['has_face']]
+        pose_points = landmarks['pose_points'][landmarks['has_pose']]
+        inferred = landmarks['inferred']
+        
         return {
             'total_frames': total_frames,
             'duration': duration,
-            'eye_contact_frames': eye_contact_frames,
-            'posture_data': posture_data,
-            'gesture_data': gesture_data,
-            'expression_data': expression_data
+            'frames_analyzed': len(landmarks['frame_indices']),
+            'inference_skipped': 1 - float(inferred.mean()) if len(inferred) else 0.0,
+            'face_landmarks': face_points,
+            'pose_landmarks': pose_points,
+            'eye_contact_frames': int(np.count_nonzero(self.detect_eye_contact(face_points))),
+            'posture_data': self.analyze_posture(pose_points),
+            'gesture_data': self.detect_gestures(pose_points),
+            'expression_data': self.analyze_expression(face_points)
         }
     
-    def detect_eye_contact(self, face_landmarks):
-        """Detect if person is looking at camera"""
+    def detect_eye_contact(self, face_points):
+        """Detect frames where the person is looking at the camera.
+        
+        face_points is a (frames, landmarks, 3) array; returns one bool per frame.
+        """
         # Simplified eye contact detection
         # Using relative positions of eye landmarks
-        left_eye = []
-        right_eye = []
-        
-        # Left eye landmarks (indices 33, 133, 157, 158, 159, 160, 161, 173)
-        left_eye_indices = [33, 133, 157, 158, 159, 160, 161, 173]
-        for idx in left_eye_indices:
-            landmark = face_landmarks.landmark[idx]
-            left_eye.append((landmark.x, landmark.y))
-        
-        # Right eye landmarks (indices 362, 263, 387, 388, 389, 390, 391, 466)
-        right_eye_indices = [362, 263, 387, 388, 389, 390, 391, 466]
-        for idx in right_eye_indices:
-            landmark = face_landmarks.landmark[idx]
-            right_eye.append((landmark.x, landmark.y))
-        
-        # Calculate eye aspect ratio (simplified)
-        left_ear = self.eye_aspect_ratio(left_eye)
-        right_ear = self.eye_aspect_ratio(right_eye)
+        left_ear = self.eye_aspect_ratio(face_points[:, LEFT_EYE_INDICES, :2])
+        right_ear = self.eye_aspect_ratio(face_points[:, RIGHT_EYE_INDICES, :2])
         
         # If eyes are open (not blinking) and centered
-        if left_ear > 0.2 and right_ear > 0.2:
-            return True
-        return False
+        return (left_ear > 0.2) & (right_ear > 0.2)
     
     def eye_aspect_ratio(self, eye_points):
-        """Calculate eye aspect ratio"""
-        if len(eye_points) < 6:
-            return 0
+        """Calculate eye aspect ratio for a (frames, points, 2) array"""
+        if eye_points.shape[1] < 6:
+            return np.zeros(len(eye_points))
         
         # Vertical distances
-        A = np.linalg.norm(np.array(eye_points[1]) - np.array(eye_points[5]))
-        B = np.linalg.norm(np.array(eye_points[2]) - np.array(eye_points[4]))
+        A = np.linalg.norm(eye_points[:, 1] - eye_points[:, 5], axis=1)
+        B = np.linalg.norm(eye_points[:, 2] - eye_points[:, 4], axis=1)
         
         # Horizontal distance
-        C = np.linalg.norm(np.array(eye_points[0]) - np.array(eye_points[3]))
+        C = np.linalg.norm(eye_points[:, 0] - eye_points[:, 3], axis=1)
         
-        if C == 0:
-            return 0
-        
-        ear = (A + B) / (2.0 * C)
+        ear = np.zeros(len(eye_points))
+        np.divide(A + B, 2.0 * C, out=ear, where=C != 0)
         return ear
     
-    def analyze_posture(self, pose_landmarks):
-        """Analyze posture from pose landmarks"""
-        # Get key points
-        left_shoulder = pose_landmarks.landmark[self.mp_pose.PoseLandmark.LEFT_SHOULDER]
-        right_shoulder = pose_landmarks.landmark[self.mp_pose.PoseLandmark.RIGHT_SHOULDER]
-        left_hip = pose_landmarks.landmark[self.mp_pose.PoseLandmark.LEFT_HIP]
-        right_hip = pose_landmarks.landmark[self.mp_pose.PoseLandmark.RIGHT_HIP]
-        
-        # Calculate shoulder alignment
-        shoulder_diff = abs(left_shoulder.y - right_shoulder.y)
-        hip_diff = abs(left_hip.y - right_hip.y)
+    def analyze_posture(self, pose_points):
+        """Analyze posture for a (frames, landmarks, 3) pose array"""
+        # Key point heights
+        left_shoulder_y = pose_points[:, LEFT_SHOULDER, 1]
+        right_shoulder_y = pose_points[:, RIGHT_SHOULDER, 1]
+        left_hip_y = pose_points[:, LEFT_HIP, 1]
+        right_hip_y = pose_points[:, RIGHT_HIP, 1]
         
         # Calculate spine alignment
-        avg_shoulder_y = (left_shoulder.y + right_shoulder.y) / 2
-        avg_hip_y = (left_hip.y + right_hip.y) / 2
-        
-        spine_angle = abs(avg_shoulder_y - avg_hip_y)
+        avg_shoulder_y = (left_shoulder_y + right_shoulder_y) / 2
+        avg_hip_y = (left_hip_y + right_hip_y) / 2
         
         return {
-            'shoulder_alignment': shoulder_diff,
-            'hip_alignment': hip_diff,
-            'spine_straightness': spine_angle
+            'shoulder_alignment': np.abs(left_shoulder_y - right_shoulder_y),
+            'hip_alignment': np.abs(left_hip_y - right_hip_y),
+            'spine_straightness': np.abs(avg_shoulder_y - avg_hip_y)
         }
     
-    def detect_gestures(self, pose_landmarks):
-        """Detect hand gestures"""
-        left_hand_raised = False
-        right_hand_raised = False
-        
-        # Check if hands are above shoulders
-        left_wrist = pose_landmarks.landmark[self.mp_pose.PoseLandmark.LEFT_WRIST]
-        right_wrist = pose_landmarks.landmark[self.mp_pose.PoseLandmark.RIGHT_WRIST]
-        left_shoulder = pose_landmarks.landmark[self.mp_pose.PoseLandmark.LEFT_SHOULDER]
-        right_shoulder = pose_landmarks.landmark[self.mp_pose.PoseLandmark.RIGHT_SHOULDER]
-        
-        if left_wrist.y < left_shoulder.y:
-            left_hand_raised = True
-        if right_wrist.y < right_shoulder.y:
-            right_hand_raised = True
+    def detect_gestures(self, pose_points):
+        """Detect hand gestures (hands above shoulders) for a pose array"""
+        left_hand_raised = pose_points[:, LEFT_WRIST, 1] < pose_points[:, LEFT_SHOULDER, 1]
+        right_hand_raised = pose_points[:, RIGHT_WRIST, 1] < pose_points[:, RIGHT_SHOULDER, 1]
         
         return {
             'left_hand_raised': left_hand_raised,
             'right_hand_raised': right_hand_raised,
-            'gesturing': left_hand_raised or right_hand_raised
+            'gesturing': left_hand_raised | right_hand_raised
         }
     
-    def analyze_expression(self, face_landmarks):
-        """Analyze facial expression"""
+    def analyze_expression(self, face_points):
+        """Analyze facial expression for a face landmark array"""
         # Simplified smile detection
-        mouth_left = face_landmarks.landmark[61]
-        mouth_right = face_landmarks.landmark[291]
-        mouth_top = face_landmarks.landmark[13]
-        mouth_bottom = face_landmarks.landmark[14]
-        
-        mouth_width = abs(mouth_right.x - mouth_left.x)
-        mouth_height = abs(mouth_bottom.y - mouth_top.y)
+        mouth_width = np.abs(face_points[:, MOUTH_RIGHT, 0] - face_points[:, MOUTH_LEFT, 0])
+        mouth_height = np.abs(face_points[:, MOUTH_BOTTOM, 1] - face_points[:, MOUTH_TOP, 1])
         
         # Smile ratio
-        if mouth_height > 0:
-            smile_ratio = mouth_width / mouth_height
-            smiling = smile_ratio > 2.0
-        else:
-            smiling = False
+        smile_ratio = np.zeros(len(face_points))
+        np.divide(mouth_width, mouth_height, out=smile_ratio, where=mouth_height > 0)
         
         return {
-            'smiling': smiling,
+            'smiling': smile_ratio > 2.0,
             'mouth_openness': mouth_height
         }
     
-    def calculate_eye_contact_score(self, eye_contact_frames):
+    def calculate_eye_contact_score(self, eye_contact_frames, frames_analyzed=MAX_FRAMES):
         """Calculate eye contact score"""
         # Base score on percentage of frames with eye contact
-        if eye_contact_frames == 0:
+        if eye_contact_frames == 0 or frames_analyzed <= 0:
             return 30
         
-        # Assuming we analyzed 300 frames max
-        percentage = (eye_contact_frames / 300) * 100
+        percentage = (eye_contact_frames / frames_analyzed) * 100
         
         if percentage >= 70:
             return 90
@@ -264,34 +446,28 @@ class VideoAnalyzer:
     
     def calculate_posture_score(self, posture_data):
         """Calculate posture score"""
-        if not posture_data:
+        if len(posture_data['shoulder_alignment']) == 0:
             return 50
         
-        # Average alignment scores
-        shoulder_scores = []
-        spine_scores = []
-        
-        for posture in posture_data:
-            # Good posture has low differences
-            shoulder_score = max(0, 100 - (posture['shoulder_alignment'] * 1000))
-            spine_score = max(0, 100 - (posture['spine_straightness'] * 1000))
-            
-            shoulder_scores.append(shoulder_score)
-            spine_scores.append(spine_score)
-        
-        avg_shoulder = np.mean(shoulder_scores) if shoulder_scores else 50
-        avg_spine = np.mean(spine_scores) if spine_scores else 50
-        
-        return (avg_shoulder + avg_spine) / 2
+        shoulder_scores, spine_scores = self.posture_frame_scores(posture_data)
+        return float((shoulder_scores.mean() + spine_scores.mean()) / 2)
+    
+    def posture_frame_scores(self, posture_data):
+        """Per-frame shoulder and spine scores"""
+        # Good posture has low differences
+        shoulder_scores = np.maximum(0, 100 - (posture_data['shoulder_alignment'] * 1000))
+        spine_scores = np.maximum(0, 100 - (posture_data['spine_straightness'] * 1000))
+        return shoulder_scores, spine_scores
     
     def calculate_gesture_score(self, gesture_data):
         """Calculate gesture score"""
-        if not gesture_data:
+        if len(gesture_data['gesturing']) == 0:
             return 50
         
-        gesture_counts = [g['gesturing'] for g in gesture_data]
-        gesture_percentage = sum(gesture_counts) / len(gesture_counts) * 100
-        
+        return self.gesture_score_from_percentage(np.mean(gesture_data['gesturing']) * 100)
+    
+    def gesture_score_from_percentage(self, gesture_percentage):
+        """Gesture score from the percentage of frames with gesturing"""
         # Moderate gesturing is best (30-60%)
         if 30 <= gesture_percentage <= 60:
             return 85
@@ -304,12 +480,13 @@ class VideoAnalyzer:
     
     def calculate_expression_score(self, expression_data):
         """Calculate facial expression score"""
-        if not expression_data:
+        if len(expression_data['smiling']) == 0:
             return 50
         
-        smile_counts = [e['smiling'] for e in expression_data]
-        smile_percentage = sum(smile_counts) / len(smile_counts) * 100
-        
+        return self.expression_score_from_percentage(np.mean(expression_data['smiling']) * 100)
+    
+    def expression_score_from_percentage(self, smile_percentage):
+        """Expression score from the percentage of frames with a smile"""
         # Some smiling is good, but not forced
         if 20 <= smile_percentage <= 50:
             return 80
@@ -0,0 +1,208 @@
+import queue
+import threading
+
+import cv2
+import numpy as np
+
+from frame_sampler import downscale, MotionGate
+from video_ai import FACE_LANDMARK_COUNT, POSE_LANDMARK_COUNT, copy_landmarks
+
+
+class RunningVideoFeatures:
+    """Constant-memory running totals of the per-frame video metrics"""
+
+    def __init__(self):
+        self.frames_analyzed = 0
+        self.eye_contact_frames = 0
+        self.face_frames = 0
+        self.smile_frames = 0
+        self.pose_frames = 0
+        self.gesture_frames = 0
+        self.shoulder_score_sum = 0.0
+        self.spine_score_sum = 0.0
+
+    def add(self, analyzer, face_points, pose_points):
+        """Add landmark arrays for a batch of frames (either may have zero rows)"""
+        if len(face_points):
+            self.face_frames += len(face_points)
+            self.eye_contact_frames += int(np.count_nonzero(analyzer.detect_eye_contact(face_points)))
+            self.smile_frames += int(np.count_nonzero(analyzer.analyze_expression(face_points)['smiling']))
+
+        if len(pose_points):
+            self.pose_frames += len(pose_points)
+            shoulder_scores, spine_scores = analyzer.posture_frame_scores(analyzer.analyze_posture(pose_points))
+            self.shoulder_score_sum += float(shoulder_scores.sum())
+            self.spine_score_sum += float(spine_scores.sum())
+            self.gesture_frames += int(np.count_nonzero(analyzer.detect_gestures(pose_points)['gesturing']))
+
+    def scores(self, analyzer):
+        """The four scores, computed the same way as for a finished video"""
+        eye_contact_score = analyzer.calculate_eye_contact_score(self.eye_contact_frames, self.frames_analyzed)
+
+        if self.pose_frames:
+            posture_score = (self.shoulder_score_sum + self.spine_score_sum) / self.pose_frames / 2
+            gesture_score = analyzer.gesture_score_from_percentage(self.gesture_frames / self.pose_frames * 100)
+        else:
+            posture_score = 50
+            gesture_score = 50
+
+        if self.face_frames:
+            expression_score = analyzer.expression_score_from_percentage(self.smile_frames / self.face_frames * 100)
+        else:
+            expression_score = 50
+
+        return eye_contact_score, posture_score, gesture_score, expression_score
+
+
+class VideoStream:
+    """Incremental video analysis for frames that arrive while recording.
+
+    Frames are queued and processed by a background thread using graphs
+    checked out from the analyzer's pool, and only running totals are kept.
+    finish() just has to drain the queue and turn the totals into scores.
+    """
+
+    def __init__(self, analyzer, fps=30.0, stride=1, max_queue=64):
+        self.analyzer = analyzer
+        self.fps = fps
+        # Analyze every stride-th received frame
+        self.stride = max(1, stride)
+        self.totals = RunningVideoFeatures()
+        self.frames_received = 0
+        self.frames_dropped = 0
+        self.gate = MotionGate(analyzer.motion_threshold, analyzer.max_skip)
+        self.totals_lock = threading.Lock()
+        # Set if the background thread stopped early (e.g. no graphs available)
+        self.error = None
+
+        # Bounded queue: if inference falls behind, frames are dropped, not buffered
+        self._frames = queue.Queue(maxsize=max_queue)
+        self._worker = threading.Thread(target=self._process_frames, daemon=True)
+        self._worker.start()
+        self.finished = False
+
+    def feed_frame(self, frame, block=False):
+        """Add one decoded BGR frame.
+
+        Live frames are dropped when inference falls behind; with block=True
+        (recorded segments) the caller waits for room in the queue instead.
+        """
+        self.frames_received += 1
+        if (self.frames_received - 1) % self.stride:
+            return
+        if block:
+            if not self._put(frame):
+                self.frames_dropped += 1
+            return
+        try:
+            self._frames.put_nowait(frame)
+        except queue.Full:
+            self.frames_dropped += 1
+
+    def _put(self, item):
+        """Blocking put that gives up once the background thread has stopped"""
+        while self._worker.is_alive():
+            try:
+                self._frames.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def feed_encoded(self, data):
+        """Add one encoded image frame (JPEG, PNG, ...)"""
+        frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            raise ValueError("Could not decode frame")
+        self.feed_frame(frame)
+
+    def feed_segment(self, segment_path):
+        """Add every frame of a short self-contained video segment"""
+        cap = cv2.VideoCapture(segment_path)
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            self.feed_frame(frame, block=True)
+        cap.release()
+
+    def _process_frames(self):
+        try:
+            self._run_inference()
+        except Exception as e:
+            print(f"Video stream stopped: {e}")
+            self.error = str(e)
+
+    def _run_inference(self):
+        # Reused single-frame landmark rows
+        face_points = np.zeros((1, FACE_LANDMARK_COUNT, 3), dtype=np.float32)
+        pose_points = np.zeros((1, POSE_LANDMARK_COUNT, 3), dtype=np.float32)
+        has_face = False
+        has_pose = False
+
+        with self.analyzer.graph_pool.checkout() as (face_mesh, pose):
+            while True:
+                frame = self._frames.get()
+                if frame is None:
+                    return
+                try:
+                    # Unchanged scene: count the last inferred landmarks again
+                    if self.gate.needs_inference(frame):
+                        frame = downscale(frame, self.analyzer.downscale_width)
+                        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                        face_results = face_mesh.process(rgb_frame)
+                        pose_results = pose.process(rgb_frame)
+
+                        has_face = bool(face_results.multi_face_landmarks)
+                        has_pose = bool(pose_results.pose_landmarks)
+                        if has_face:
+                            copy_landmarks(face_results.multi_face_landmarks[0], face_points[0])
+                        if has_pose:
+                            copy_landmarks(pose_results.pose_landmarks, pose_points[0])
+
+                    with self.totals_lock:
+                        self.totals.frames_analyzed += 1
+                        self.totals.add(
+                            self.analyzer,
+                            face_points if has_face else face_points[:0],
+                            pose_points if has_pose else pose_points[:0]
+                        )
+                except Exception as e:
+                    print(f"Streaming frame error: {e}")
+
+    def features(self):
+        duration = self.frames_received / self.fps if self.fps > 0 else 0
+        return {
+            'total_frames': self.frames_received,
+            'duration': duration,
+            'frames_analyzed': self.totals.frames_analyzed,
+            'frames_dropped': self.frames_dropped,
+            'inference_skipped': self.gate.skipped_fraction
+        }
+
+    def snapshot(self):
+        """Running scores while recording"""
+        with self.totals_lock:
+            scores = self.totals.scores(self.analyzer)
+        result = self.analyzer.build_result(*scores, self.features())
+        result['partial'] = True
+        return result
+
+    def finish(self):
+        """Stop ingesting and return the same result as VideoAnalyzer.analyze_video"""
+        if not self.finished:
+            self.finished = True
+            self._put(None)
+        self._worker.join()
+
+        if self.error is not None:
+            return {'success': False, 'error': f"Video analysis failed: {self.error}"}
+
+        try:
+            with self.totals_lock:
+                scores = self.totals.scores(self.analyzer)
+            result = self.analyzer.build_result(*scores, self.features())
+            result['analysis']['frames_dropped'] = self.frames_dropped
+            return result
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
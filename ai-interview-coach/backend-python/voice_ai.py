@@ -1,22 +1,55 @@
-import speech_recognition as sr
-import librosa
 import numpy as np
-from textblob import TextBlob
-import language_tool_python
 import json
 import tempfile
 import os
+import time
+from grammar_service import get_grammar_checker
+from question_index import get_question_index
+from semantic_relevance import get_semantic_relevance
+from audio_buffer import AudioBuffer
+from speech_backends import get_backend
+from instrumentation import span, add_time, start_timings, attach_timings, profiled
 
 class VoiceAnalyzer:
-    def __init__(self):
-        self.recognizer = sr.Recognizer()
-        self.tool = language_tool_python.LanguageTool('en-US')
+    def __init__(self, stt_backend=None):
+        # Speech-to-text engine, created on first use (VOICE_STT_BACKEND picks the default)
+        self._stt = stt_backend
+        # Shared with every other analyzer in this process
+        self.tool = get_grammar_checker()
+        # Keyword weights of the known questions, for relevance scoring
+        self.questions = get_question_index()
+        # Embedding similarity instead, with RELEVANCE_ENGINE=semantic (None otherwise)
+        self.semantic = get_semantic_relevance()
     
-    def analyze_audio(self, audio_path, question):
-        """Analyze audio recording for speech quality"""
+    @property
+    def stt(self):
+        if self._stt is None:
+            self._stt = get_backend()
+        return self._stt
+    
+    @profiled('voice')
+    def analyze_audio(self, audio_path, question, timings=None, question_id=None):
+        """Analyze audio recording for speech quality.
+        
+        question_id selects the question's precomputed keywords from the
+        question index; question is used when it isn't indexed.
+        timings may be True or a dict to add per-stage seconds to the result.
+        """
+        timings = start_timings(timings)
+        result = self.run_analysis(audio_path, question, timings, question_id)
+        return attach_timings(result, timings)
+    
+    def run_analysis(self, audio_path, question, timings=None, question_id=None):
         try:
+            # Decode once, shared by transcription and feature extraction
+            with span(timings, 'decode_audio'):
+                audio = AudioBuffer.load(audio_path)
+            
             # Convert audio to text
-            text = self.speech_to_text(audio_path)
+            stt_start = time.perf_counter()
+            text = self.speech_to_text(audio)
+            stt_seconds = time.perf_counter() - stt_start
+            add_time(timings, 'speech_to_text', stt_seconds)
             
             if not text:
                 return {
@@ -25,53 +58,66 @@ class VoiceAnalyzer:
                 }
             
             # Analyze transcription
-            text_analysis = self.analyze_text(text, question)
+            with span(timings, 'analyze_text'):
+                text_analysis = self.analyze_text(text, question, question_id=question_id)
             
             # Analyze audio features
-            audio_features = self.analyze_audio_features(audio_path)
-            
-            # Calculate overall score
-            overall_score = (
-                text_analysis['clarity_score'] * 0.3 +
-                text_analysis['fluency_score'] * 0.3 +
-                audio_features['confidence_score'] * 0.2 +
-                audio_features['pace_score'] * 0.2
-            )
-            
-            # Generate feedback
-            feedback = self.generate_feedback(
-                text_analysis, audio_features, text
-            )
+            with span(timings, 'audio_features'):
+                audio_features = self.analyze_audio_features(audio)
             
-            return {
-                'success': True,
-                'transcription': text,
-                'text_analysis': text_analysis,
-                'audio_features': audio_features,
-                'overall_score': round(overall_score, 2),
-                'feedback': feedback
-            }
+            return self.build_result(text, text_analysis, audio_features, stt_seconds)
             
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def speech_to_text(self, audio_path):
-        """Convert speech to text using Google Speech Recognition"""
-        try:
-            with sr.AudioFile(audio_path) as source:
-                audio_data = self.recognizer.record(source)
-                text = self.recognizer.recognize_google(audio_data)
-                return text
-        except sr.UnknownValueError:
-            return ""
-        except sr.RequestError as e:
-            print(f"Could not request results; {e}")
-            return ""
+    def build_result(self, text, text_analysis, audio_features, stt_seconds):
+        """Combine text and audio analysis into the final result"""
+        # Calculate overall score
+        overall_score = (
+            text_analysis['clarity_score'] * 0.3 +
+            text_analysis['fluency_score'] * 0.3 +
+            audio_features['confidence_score'] * 0.2 +
+            audio_features['pace_score'] * 0.2
+        )
+        
+        # Generate feedback
+        feedback = self.generate_feedback(
+            text_analysis, audio_features, text
+        )
+        
+        return {
+            'success': True,
+            'transcription': text,
+            'text_analysis': text_analysis,
+            'audio_features': audio_features,
+            'overall_score': round(overall_score, 2),
+            'feedback': feedback,
+            'speech_to_text': {
+                'backend': self.stt.name,
+                'seconds': round(stt_seconds, 3)
+            }
+        }
+    
+    def start_stream(self, question, sample_rate=16000, question_id=None):
+        """Start incremental analysis for audio that arrives in chunks"""
+        from voice_stream import VoiceStream
+        return VoiceStream(self, question, sample_rate=sample_rate, question_id=question_id)
+    
+    def speech_to_text(self, audio):
+        """Convert speech to text with the configured backend.
+        
+        audio is an AudioBuffer or a path to an audio file.
+        """
+        if not isinstance(audio, AudioBuffer):
+            audio = AudioBuffer.load(audio)
+        
+        return self.stt.transcribe(audio)
     
-    def analyze_text(self, text, question):
+    def analyze_text(self, text, question, matches=None, question_id=None):
         """Analyze transcribed text"""
-        # Grammar check
-        matches = self.tool.check(text)
+        # Grammar check (matches may already come from a streaming session)
+        if matches is None:
+            matches = self.tool.check(text)
         grammar_errors = len(matches)
         grammar_score = max(0, 100 - (grammar_errors * 3))
         
@@ -83,7 +129,7 @@ class VoiceAnalyzer:
         clarity_score = self.calculate_clarity_score(text)
         
         # Relevance to question
-        relevance_score = self.calculate_relevance_score(question, text)
+        relevance_score = self.calculate_relevance_score(question, text, question_id)
         
         return {
             'grammar_errors': grammar_errors,
@@ -93,43 +139,19 @@ class VoiceAnalyzer:
             'relevance_score': round(relevance_score, 2)
         }
     
-    def analyze_audio_features(self, audio_path):
-        """Analyze audio features like pace, pauses, etc."""
+    def analyze_audio_features(self, audio):
+        """Analyze audio features like pace, pauses, etc.
+        
+        audio is an AudioBuffer or a path to an audio file.
+        """
         try:
-            # Load audio file
-            y, sr = librosa.load(audio_path)
-            
-            # Calculate speaking rate (words per minute approximation)
-            duration = librosa.get_duration(y=y, sr=sr)
-            words = len(librosa.effects.split(y, top_db=30)) / 10  # Approximation
-            wpm = (words / duration) * 60 if duration > 0 else 0
-            
-            # Pace score (optimal 120-150 WPM)
-            if 120 <= wpm <= 150:
-                pace_score = 100
-            elif 100 <= wpm < 120 or 150 < wpm <= 180:
-                pace_score = 70
-            else:
-                pace_score = 50
-            
-            # Detect pauses (silence)
-            intervals = librosa.effects.split(y, top_db=30)
-            pause_count = len(intervals) - 1
-            pause_score = max(0, 100 - (pause_count * 5))
-            
-            # Confidence (based on volume consistency)
-            rms = librosa.feature.rms(y=y)
-            volume_variance = np.var(rms)
-            confidence_score = max(0, 100 - (volume_variance * 100))
+            if not isinstance(audio, AudioBuffer):
+                audio = AudioBuffer.load(audio)
             
-            return {
-                'duration': round(duration, 2),
-                'estimated_wpm': round(wpm, 2),
-                'pace_score': round(pace_score, 2),
-                'pause_count': pause_count,
-                'pause_score': round(pause_score, 2),
-                'confidence_score': round(min(confidence_score, 100), 2)
-            }
+            # Non-silent segments, computed once for words and pauses
+            return self.score_audio_features(
+                audio.duration, len(audio.nonsilent_intervals(top_db=30)), float(np.var(audio.rms()))
+            )
             
         except Exception as e:
             print(f"Audio feature analysis error: {e}")
@@ -142,6 +164,37 @@ class VoiceAnalyzer:
                 'confidence_score': 50
             }
     
+    def score_audio_features(self, duration, interval_count, volume_variance):
+        """Pace, pause and confidence scores from the number of non-silent
+        intervals and the variance of the frame RMS"""
+        # Calculate speaking rate (words per minute approximation)
+        words = interval_count / 10  # Approximation
+        wpm = (words / duration) * 60 if duration > 0 else 0
+        
+        # Pace score (optimal 120-150 WPM)
+        if 120 <= wpm <= 150:
+            pace_score = 100
+        elif 100 <= wpm < 120 or 150 < wpm <= 180:
+            pace_score = 70
+        else:
+            pace_score = 50
+        
+        # Detect pauses (silence)
+        pause_count = interval_count - 1
+        pause_score = max(0, 100 - (pause_count * 5))
+        
+        # Confidence (based on volume consistency)
+        confidence_score = max(0, 100 - (volume_variance * 100))
+        
+        return {
+            'duration': round(duration, 2),
+            'estimated_wpm': round(wpm, 2),
+            'pace_score': round(pace_score, 2),
+            'pause_count': pause_count,
+            'pause_score': round(pause_score, 2),
+            'confidence_score': round(min(confidence_score, 100), 2)
+        }
+    
     def calculate_fluency_score(self, sentences):
         """Calculate fluency based on sentence structure"""
         if not sentences or len(sentences) < 2:
@@ -182,17 +235,12 @@ class VoiceAnalyzer:
         else:
             return 55
     
-    def calculate_relevance_score(self, question, answer):
+    def calculate_relevance_score(self, question, answer, question_id=None):
         """Calculate relevance between question and answer"""
-        q_words = set(question.lower().split())
-        a_words = set(answer.lower().split())
-        
-        if not q_words:
-            return 50
-        
-        common_words = q_words.intersection(a_words)
-        relevance = len(common_words) / len(q_words) * 100
-        return min(relevance, 100)
+        if self.semantic is not None:
+            return self.semantic.score(question, answer, question_id)
+        # TF-IDF weighted share of the question's stemmed keywords in the answer
+        return self.questions.relevance(answer, question_id, question)
     
     def generate_feedback(self, text_analysis, audio_features, transcription):
         """Generate comprehensive feedback"""
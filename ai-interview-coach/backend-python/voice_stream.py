@@ -0,0 +1,229 @@
+import math
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+
+from audio_buffer import AudioBuffer, FRAME_LENGTH, HOP_LENGTH, split_nonsilent
+
+# Frames quieter than this (dBFS) are never speech, so background noise
+# before the first loud frame doesn't count as talking
+SPEECH_FLOOR_DB = -50
+
+
+class VoiceStream:
+    """Incremental voice analysis for audio that arrives in chunks.
+
+    Frame RMS, pauses and the partial transcript are updated as chunks come
+    in. Speech is cut into segments at pauses and each segment is
+    transcribed and grammar checked on a background thread. finish() only
+    has to wait for the last segment, so its cost does not grow with the
+    length of the answer.
+    """
+
+    def __init__(self, analyzer, question, sample_rate=16000, top_db=30,
+                 min_pause_seconds=0.5, max_segment_seconds=20, question_id=None,
+                 floor_db=SPEECH_FLOOR_DB):
+        self.analyzer = analyzer
+        self.question = question
+        self.question_id = question_id
+        self.sample_rate = sample_rate
+        self.top_db = top_db
+        self.floor_db = floor_db
+        self.min_pause_frames = max(1, int(min_pause_seconds * sample_rate / HOP_LENGTH))
+        self.max_segment_samples = int(max_segment_seconds * sample_rate)
+
+        # One RMS value per hop, kept for the exact pause split in finish()
+        self.frame_rms = []
+        self.total_samples = 0
+        self._next_frame = 0
+        self._peak = 0.0
+
+        # Running totals for live scores: RMS sum and sum of squares for the
+        # variance, and non-silent intervals seen so far
+        self._rms_sum = 0.0
+        self._rms_square_sum = 0.0
+        self._intervals = 0
+        self._speaking = False
+
+        # Samples not yet transcribed, starting at absolute sample _buffer_start
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_start = 0
+
+        # Current speech segment (absolute sample positions)
+        self._segment_start = None
+        self._segment_end = None
+        self._silent_frames = 0
+
+        self.transcript_parts = []
+        self.matches = []
+        self.stt_seconds = 0.0
+        self.error = None
+        self._results_lock = threading.Lock()
+        self._segments = queue.Queue()
+        self._worker = threading.Thread(target=self._transcribe_segments, daemon=True)
+        self._worker.start()
+        self.finished = False
+
+    def feed(self, samples):
+        """Add float samples in [-1, 1] and return the running analysis"""
+        samples = np.asarray(samples, dtype=np.float32)
+        self._buffer = np.concatenate([self._buffer, samples])
+        self.total_samples += len(samples)
+
+        while self._next_frame + FRAME_LENGTH <= self.total_samples:
+            offset = self._next_frame - self._buffer_start
+            frame = self._buffer[offset:offset + FRAME_LENGTH]
+            rms = float(np.sqrt(np.mean(frame ** 2)))
+            self.frame_rms.append(rms)
+            self._rms_sum += rms
+            self._rms_square_sum += rms * rms
+            self._track_speech(rms, self._next_frame)
+            self._next_frame += HOP_LENGTH
+
+        self._trim_buffer()
+        return self.snapshot()
+
+    def feed_pcm16(self, data):
+        """Add 16-bit little-endian mono PCM bytes"""
+        samples = np.frombuffer(data, dtype='<i2').astype(np.float32) / 32768.0
+        return self.feed(samples)
+
+    def _track_speech(self, rms, frame_start):
+        """Cut speech into segments at pauses, relative to the loudest frame
+        so far but never below floor_db"""
+        self._peak = max(self._peak, rms)
+        speaking = rms > 0 and 20 * math.log10(rms) > max(20 * math.log10(self._peak) - self.top_db, self.floor_db)
+
+        if speaking and not self._speaking:
+            self._intervals += 1
+        self._speaking = speaking
+
+        if speaking:
+            if self._segment_start is None:
+                self._segment_start = frame_start
+            self._segment_end = frame_start + FRAME_LENGTH
+            self._silent_frames = 0
+        elif self._segment_start is not None:
+            self._silent_frames += 1
+            if self._silent_frames >= self.min_pause_frames:
+                self._flush_segment()
+
+        if self._segment_start is not None and frame_start - self._segment_start >= self.max_segment_samples:
+            self._flush_segment()
+
+    def _flush_segment(self, end=None):
+        """Queue the current speech segment for transcription"""
+        if self._segment_start is None:
+            return
+        end = min(end or self._segment_end, self.total_samples)
+        start = self._segment_start - self._buffer_start
+        segment = self._buffer[start:end - self._buffer_start].copy()
+        self._segments.put(AudioBuffer(segment, self.sample_rate))
+        self._segment_start = None
+        self._segment_end = None
+        self._silent_frames = 0
+
+    def _trim_buffer(self):
+        """Drop samples that are neither in an open segment nor needed for the next frame"""
+        keep_from = self._next_frame
+        if self._segment_start is not None:
+            keep_from = min(keep_from, self._segment_start)
+        drop = keep_from - self._buffer_start
+        if drop > 0:
+            self._buffer = self._buffer[drop:]
+            self._buffer_start = keep_from
+
+    def _transcribe_segments(self):
+        while True:
+            audio = self._segments.get()
+            if audio is None:
+                return
+            try:
+                start = time.perf_counter()
+                text = self.analyzer.stt.transcribe(audio)
+                elapsed = time.perf_counter() - start
+            except Exception as e:
+                print(f"Streaming transcription error: {e}", file=sys.stderr)
+                with self._results_lock:
+                    self.error = str(e)
+                continue
+
+            try:
+                matches = self.analyzer.tool.check(text) if text else []
+            except Exception as e:
+                # finish() grammar checks the whole transcript instead
+                print(f"Streaming grammar check error: {e}", file=sys.stderr)
+                matches = None
+
+            with self._results_lock:
+                self.stt_seconds += elapsed
+                if text:
+                    self.transcript_parts.append(text)
+                    if matches is None:
+                        self.matches = None
+                    elif self.matches is not None:
+                        self.matches.extend(matches)
+
+    def transcript(self):
+        with self._results_lock:
+            return " ".join(self.transcript_parts)
+
+    def volume_variance(self):
+        count = len(self.frame_rms)
+        if not count:
+            return 0.0
+        mean = self._rms_sum / count
+        return max(self._rms_square_sum / count - mean * mean, 0.0)
+
+    def audio_features(self, exact=False):
+        """Pace, pause and confidence scores for everything received so far.
+
+        Live scores use the running totals. exact=True splits the whole RMS
+        history against its final peak, as VoiceAnalyzer does for a file.
+        """
+        interval_count = self._intervals
+        if exact:
+            rms = np.asarray(self.frame_rms, dtype=np.float32)
+            interval_count = len(split_nonsilent(rms, self.total_samples, self.top_db))
+        duration = self.total_samples / self.sample_rate
+        return self.analyzer.score_audio_features(duration, interval_count, self.volume_variance())
+
+    def snapshot(self):
+        """Running analysis while the candidate is still speaking"""
+        return {
+            'success': True,
+            'partial_transcript': self.transcript(),
+            'audio_features': self.audio_features()
+        }
+
+    def finish(self):
+        """Close the stream and return the same result as VoiceAnalyzer.analyze_audio"""
+        if not self.finished:
+            self.finished = True
+            self._flush_segment(self.total_samples)
+            self._segments.put(None)
+        self._worker.join()
+
+        if self.error is not None:
+            return {'success': False, 'error': f"Transcription failed: {self.error}"}
+
+        try:
+            text = self.transcript()
+            if not text:
+                return {
+                    'success': False,
+                    'error': 'Could not transcribe audio. Please speak clearly.'
+                }
+
+            # Grammar matches were collected per segment while streaming (None if a check failed)
+            text_analysis = self.analyzer.analyze_text(
+                text, self.question, matches=self.matches, question_id=self.question_id
+            )
+            return self.analyzer.build_result(
+                text, text_analysis, self.audio_features(exact=True), self.stt_seconds
+            )
+        except Exception as e:
+            return {'success': False, 'error': str(e)}